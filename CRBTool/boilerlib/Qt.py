@@ -42,6 +42,11 @@ Default resolution order:
     - PySide
     - PyQt4
 
+The binding that loaded last time in the same executable is tried
+first, see QT_BINDING_CACHE. Only QtCore, QtGui and QtWidgets are
+imported up front; other submodules (and the .ui loaders) are imported
+on first access.
+
 Usage:
     >> import sys
     >> from Qt import QtWidgets
@@ -54,13 +59,21 @@ Usage:
 
 import os
 import sys
+import json
+import types
 import shutil
+import importlib
 
 # Flags from environment variables
 QT_VERBOSE = bool(os.getenv("QT_VERBOSE"))                # Extra output
 QT_TESTING = bool(os.getenv("QT_TESTING"))                # Extra constraints
 QT_PREFERRED_BINDING = os.getenv("QT_PREFERRED_BINDING")  # Override default
 
+# Binding that loaded last, per executable
+QT_BINDING_CACHE = os.getenv("QT_BINDING_CACHE") or os.path.join(
+    os.environ.get("LOCALAPPDATA", os.path.expanduser("~")),
+    "CRBTool", "cache", "qt_binding.json")
+
 self = sys.modules[__name__]
 
 # Internal members, may be used externally for debugging
@@ -150,9 +163,75 @@ def _add(object, name, value):
     setattr(object, name, value)
 
 
+class _LazyBinding(types.ModuleType):
+    """Binding package importing its Qt submodules on first access
+
+    Arguments:
+        binding (module): The binding package, e.g. PyQt5
+        aliases (dict): Submodules found under another name,
+            e.g. {"QtWebKitWidgets": "QtWebKit"} for Qt 4 bindings
+
+    """
+
+    def __init__(self, binding, aliases=None):
+        types.ModuleType.__init__(self, binding.__name__)
+        self.__dict__["_binding"] = binding
+        self.__dict__["_aliases"] = aliases or {}
+
+    def __getattr__(self, name):
+        binding = self.__dict__["_binding"]
+        try:
+            return getattr(binding, name)
+        except AttributeError:
+            if not name.startswith("Qt"):
+                raise
+        submodule = self.__dict__["_aliases"].get(name, name)
+        try:
+            module = importlib.import_module(
+                "%s.%s" % (binding.__name__, submodule))
+        except ImportError:
+            raise AttributeError(name)
+        setattr(self, name, module)
+        return module
+
+
+def _lazy_load_ui(loader):
+    """Return a load_ui importing its loader on first call"""
+    def load_ui(fname):
+        return loader()(fname)
+    return load_ui
+
+
+def _read_binding_cache():
+    try:
+        with open(QT_BINDING_CACHE) as f:
+            return json.load(f).get(sys.executable)
+    except (IOError, OSError, ValueError, AttributeError):
+        return None
+
+
+def _write_binding_cache(name):
+    try:
+        with open(QT_BINDING_CACHE) as f:
+            cache = json.load(f)
+    except (IOError, OSError, ValueError):
+        cache = {}
+    if not isinstance(cache, dict) or cache.get(sys.executable) == name:
+        return
+    cache[sys.executable] = name
+    try:
+        folder = os.path.dirname(QT_BINDING_CACHE)
+        if not os.path.isdir(folder):
+            os.makedirs(folder)
+        with open(QT_BINDING_CACHE, "w") as f:
+            json.dump(cache, f, indent=4, sort_keys=True)
+    except (IOError, OSError):
+        pass
+
+
 def _pyqt5():
-    import PyQt5.Qt
-    from PyQt5 import QtCore, QtWidgets, uic
+    import PyQt5
+    from PyQt5 import QtCore, QtGui, QtWidgets
 
     _remap(QtCore, "Signal", QtCore.pyqtSignal)
     _remap(QtCore, "Slot", QtCore.pyqtSlot)
@@ -161,14 +240,15 @@ def _pyqt5():
     _add(QtCompat, "__binding__", PyQt5.__name__)
     _add(QtCompat, "__binding_version__", PyQt5.QtCore.PYQT_VERSION_STR)
     _add(QtCompat, "__qt_version__", PyQt5.QtCore.QT_VERSION_STR)
-    _add(QtCompat, "load_ui", lambda fname: uic.loadUi(fname))
+    _add(QtCompat, "load_ui", _lazy_load_ui(
+        lambda: importlib.import_module("PyQt5.uic").loadUi))
     _add(QtCompat, "translate", QtCore.QCoreApplication.translate)
     _add(QtCompat, "setSectionResizeMode",
          QtWidgets.QHeaderView.setSectionResizeMode)
 
     _maintain_backwards_compatibility(PyQt5)
 
-    return PyQt5
+    return _LazyBinding(PyQt5)
 
 
 def _pyqt4():
@@ -189,9 +269,8 @@ def _pyqt4():
         # API version already set to v1
         raise ImportError
 
-    import PyQt4.Qt
-    from PyQt4 import QtCore, QtGui, uic
-
+    import PyQt4
+    from PyQt4 import QtCore, QtGui
 
     _remap(PyQt4, "QtWidgets", QtGui)
     _remap(QtCore, "Signal", QtCore.pyqtSignal)
@@ -203,16 +282,11 @@ def _pyqt4():
     _remap(QtCore, "QSortFilterProxyModel", QtGui.QSortFilterProxyModel)
     _remap(QtCore, "QAbstractProxyModel", QtGui.QAbstractProxyModel)
 
-    try:
-        from PyQt4 import QtWebKit
-        _remap(PyQt4, "QtWebKitWidgets", QtWebKit)
-    except ImportError:
-        "QtWebkit is optional in Qt , therefore might not be available"
-
     _add(QtCompat, "__binding__", PyQt4.__name__)
     _add(QtCompat, "__binding_version__", PyQt4.QtCore.PYQT_VERSION_STR)
     _add(QtCompat, "__qt_version__", PyQt4.QtCore.QT_VERSION_STR)
-    _add(QtCompat, "load_ui", lambda fname: uic.loadUi(fname))
+    _add(QtCompat, "load_ui", _lazy_load_ui(
+        lambda: importlib.import_module("PyQt4.uic").loadUi))
     _add(QtCompat, "setSectionResizeMode", QtGui.QHeaderView.setResizeMode)
 
     # PySide2 differs from Qt4 in that Qt4 has one extra argument
@@ -229,19 +303,21 @@ def _pyqt4():
 
     _maintain_backwards_compatibility(PyQt4)
 
-    return PyQt4
+    # QtWebkit is optional in Qt, it is only imported when used
+    return _LazyBinding(PyQt4, {"QtWebKitWidgets": "QtWebKit"})
 
 
 def _pyside2():
     import PySide2
-    from PySide2 import QtGui, QtWidgets, QtCore, QtUiTools
+    from PySide2 import QtGui, QtWidgets, QtCore
 
     _remap(QtCore, "QStringListModel", QtGui.QStringListModel)
 
     _add(QtCompat, "__binding__", PySide2.__name__)
     _add(QtCompat, "__binding_version__", PySide2.__version__)
     _add(QtCompat, "__qt_version__", PySide2.QtCore.qVersion())
-    _add(QtCompat, "load_ui", lambda fname: QtUiTools.QUiLoader().load(fname))
+    _add(QtCompat, "load_ui", _lazy_load_ui(
+        lambda: importlib.import_module("PySide2.QtUiTools").QUiLoader().load))
 
     _add(QtCompat, "setSectionResizeMode",
          QtWidgets.QHeaderView.setSectionResizeMode)
@@ -250,12 +326,12 @@ def _pyside2():
 
     _maintain_backwards_compatibility(PySide2)
 
-    return PySide2
+    return _LazyBinding(PySide2)
 
 
 def _pyside():
     import PySide
-    from PySide import QtGui, QtCore, QtUiTools
+    from PySide import QtGui, QtCore
 
     _remap(PySide, "QtWidgets", QtGui)
     _remap(QtCore, "QSortFilterProxyModel", QtGui.QSortFilterProxyModel)
@@ -264,16 +340,11 @@ def _pyside():
     _remap(QtCore, "QItemSelectionModel", QtGui.QItemSelectionModel)
     _remap(QtCore, "QAbstractProxyModel", QtGui.QAbstractProxyModel)
 
-    try:
-        from PySide import QtWebKit
-        _remap(PySide, "QtWebKitWidgets", QtWebKit)
-    except ImportError:
-        "QtWebkit is optional in Qt, therefore might not be available"
-
     _add(QtCompat, "__binding__", PySide.__name__)
     _add(QtCompat, "__binding_version__", PySide.__version__)
     _add(QtCompat, "__qt_version__", PySide.QtCore.qVersion())
-    _add(QtCompat, "load_ui", lambda fname: QtUiTools.QUiLoader().load(fname))
+    _add(QtCompat, "load_ui", _lazy_load_ui(
+        lambda: importlib.import_module("PySide.QtUiTools").QUiLoader().load))
     _add(QtCompat, "setSectionResizeMode", QtGui.QHeaderView.setResizeMode)
 
     _add(QtCompat, "translate",
@@ -286,7 +357,7 @@ def _pyside():
 
     _maintain_backwards_compatibility(PySide)
 
-    return PySide
+    return _LazyBinding(PySide, {"QtWebKitWidgets": "QtWebKit"})
 
 
 def _log(text, verbose):
@@ -363,6 +434,12 @@ def init():
     """
 
     bindings = (_pyside2, _pyqt5, _pyside, _pyqt4)
+    available = {
+        "PySide2": _pyside2,
+        "PyQt5": _pyqt5,
+        "PySide": _pyside,
+        "PyQt4": _pyqt4
+    }
 
     if QT_PREFERRED_BINDING:
         # Internal flag (used in installer)
@@ -371,12 +448,6 @@ def init():
             return
 
         preferred = QT_PREFERRED_BINDING.split(os.pathsep)
-        available = {
-            "PySide2": _pyside2,
-            "PyQt5": _pyqt5,
-            "PySide": _pyside,
-            "PyQt4": _pyqt4
-        }
 
         try:
             bindings = [available[binding] for binding in preferred]
@@ -386,6 +457,13 @@ def init():
                 "\n".join(preferred)
             )
 
+    else:
+        # Start with the binding that loaded last time
+        cached = available.get(_read_binding_cache())
+        if cached is not None:
+            bindings = (cached,) + tuple(
+                binding for binding in bindings if binding is not cached)
+
     for binding in bindings:
         _log("Trying %s" % binding.__name__, QT_VERBOSE)
 
@@ -401,6 +479,9 @@ def init():
             binding.QtCompat = self
             binding.__shim__ = self  # DEPRECATED
 
+            if not QT_PREFERRED_BINDING:
+                _write_binding_cache(binding.__name__)
+
             sys.modules.update({
                 __name__: binding,
 
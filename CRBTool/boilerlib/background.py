@@ -0,0 +1,93 @@
+"""Background execution of action scripts that do not touch Maya.
+
+An action opts in by putting a marker comment in its first lines:
+
+    # crb: background
+
+Such a script runs on a QThread while the UI stays responsive. Its
+namespace gets a few helpers:
+
+    progress(value, maximum=100)  Report progress to the action button
+    cancelled()                   True once the artist asked to cancel
+    in_main_thread(func, *args)   Call func on Maya's main thread and
+                                  return its result
+
+Example:
+    # crb: background
+    files = os.listdir('G:/renders')
+    for i, name in enumerate(files):
+        if cancelled():
+            break
+        process(name)
+        progress(i + 1, len(files))
+    in_main_thread(cmds.confirmDialog, message='Done')
+"""
+
+import re
+import threading
+import traceback
+
+from .Qt import QtCore
+from .codecache import stat_key
+
+# Marker comment declaring a script free of Maya API calls
+BACKGROUND_RE = re.compile(r'^#\s*crb:\s*background\b', re.M)
+
+# Only the head of a script is searched for the marker
+HEAD_SIZE = 1024
+
+_marker_cache = {}  # stat key -> bool
+
+
+def is_background(path):
+    """Return True if given script declares itself background-safe"""
+    key = stat_key(path)
+    cached = _marker_cache.get(key)
+    if cached is None:
+        with open(key[0], 'rb') as script_file:
+            head = script_file.read(HEAD_SIZE).decode('utf-8', 'replace')
+        cached = _marker_cache[key] = bool(BACKGROUND_RE.search(head))
+    return cached
+
+
+def in_main_thread(func, *args, **kwargs):
+    """Call func on the main thread and return its result"""
+    try:
+        import maya.utils
+    except ImportError:
+        return func(*args, **kwargs)
+    return maya.utils.executeInMainThreadWithResult(func, *args, **kwargs)
+
+
+class ScriptWorker(QtCore.QThread):
+    """Run a compiled script on a worker thread"""
+
+    progress = QtCore.Signal(int, int)
+    failed = QtCore.Signal(str)
+
+    def __init__(self, code, namespace, parent=None):
+        super(ScriptWorker, self).__init__(parent)
+        self.code = code
+        self.namespace = dict(namespace)
+        self._cancel = threading.Event()
+        self.namespace.update({
+            'progress': self.report_progress,
+            'cancelled': self._cancel.is_set,
+            'in_main_thread': in_main_thread,
+        })
+
+    def report_progress(self, value, maximum=100):
+        self.progress.emit(int(value), int(maximum))
+
+    def cancel(self):
+        """Ask the script to stop at its next cancelled() check"""
+        self._cancel.set()
+
+    def is_cancelled(self):
+        return self._cancel.is_set()
+
+    def run(self):
+        try:
+            exec(self.code, self.namespace)
+        except Exception:
+            self.failed.emit(traceback.format_exc())
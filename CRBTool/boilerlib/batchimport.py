@@ -0,0 +1,142 @@
+"""Batch import/reference of Maya scenes for the Mini Script tab.
+
+All files are brought in within one pass: namespaces are planned up
+front against the namespaces already in the scene, viewport refresh is
+suspended and every file call is recorded in a single undo chunk, so
+one undo removes the whole batch. A file failing to load is reported
+and the batch goes on.
+
+Deferred references are created unloaded (`loadReferenceDepth='none'`)
+and loaded later on demand, see refpanel.
+
+Usage:
+    >> importer = BatchImporter()
+    >> results = importer.run(['G:/assets/tree.ma', 'G:/assets/tree.mb'])
+    >> print(report(results))
+    tree.ma    tree     0.412s
+    tree.mb    tree1    0.388s
+"""
+
+import os
+import re
+import time
+from collections import namedtuple
+
+FILE_TYPES = {'.ma': 'mayaAscii', '.mb': 'mayaBinary'}
+
+UNDO_CHUNK = 'CRB Batch Import'
+
+Result = namedtuple('Result', 'path namespace seconds error')
+
+
+def clean_namespace(name):
+    """Return name made a valid Maya namespace"""
+    name = re.sub(r'[^A-Za-z0-9_]', '_', name)
+    if not name or name[0].isdigit():
+        name = '_' + name
+    return name
+
+
+def plan_namespaces(paths, existing=()):
+    """Return a (path, namespace) pair per path
+
+    Namespaces are taken from the file names and numbered like Maya
+    does (`tree`, `tree1`, ...) so none clashes with an existing one or
+    with another file of the batch.
+    """
+    taken = set(namespace.lower() for namespace in existing)
+    plan = []
+    for path in paths:
+        base = clean_namespace(os.path.splitext(os.path.basename(path))[0])
+        namespace = base
+        count = 0
+        while namespace.lower() in taken:
+            count += 1
+            namespace = '{}{}'.format(base, count)
+        taken.add(namespace.lower())
+        plan.append((path, namespace))
+    return plan
+
+
+def report(results):
+    """Return a table of the file name, namespace and time of each result"""
+    rows = []
+    for result in results:
+        status = result.error or '{:.3f}s'.format(result.seconds)
+        rows.append((os.path.basename(result.path), result.namespace, status))
+    rows.append(('Total', '', '{:.3f}s'.format(
+        sum(result.seconds for result in results))))
+    widths = [max(len(row[i]) for row in rows) for i in range(2)]
+    return '\n'.join('{:<{}}    {:<{}}    {}'.format(
+        row[0], widths[0], row[1], widths[1], row[2]) for row in rows)
+
+
+class BatchImporter(object):
+    """Import or reference several scenes in one undo chunk"""
+
+    def __init__(self, cmds=None):
+        self._cmds = cmds
+
+    @property
+    def cmds(self):
+        if self._cmds is None:
+            import maya.cmds
+            self._cmds = maya.cmds
+        return self._cmds
+
+    def existing_namespaces(self):
+        namespaces = self.cmds.namespaceInfo(
+            ':', listOnlyNamespaces=True, recurse=True) or []
+        return [namespace.lstrip(':') for namespace in namespaces]
+
+    def plan(self, paths):
+        """Return the (path, namespace) pairs a run would use"""
+        paths = [path for path in paths
+                 if os.path.splitext(path)[1].lower() in FILE_TYPES]
+        return plan_namespaces(paths, self.existing_namespaces())
+
+    def load_file(self, path, namespace, reference=False, deferred=False):
+        file_type = FILE_TYPES[os.path.splitext(path)[1].lower()]
+        if reference:
+            self.cmds.file(path, reference=True, ignoreVersion=True,
+                           type=file_type, namespace=namespace,
+                           groupLocator=True, mergeNamespacesOnClash=False,
+                           loadReferenceDepth='none' if deferred else 'all',
+                           options='v=0;p=17;f=0')
+        else:
+            self.cmds.file(path, i=True, preserveReferences=True,
+                           ignoreVersion=True, type=file_type,
+                           namespace=namespace, renameAll=True,
+                           mergeNamespacesOnClash=False,
+                           options='v=0;p=17;f=0')
+
+    def run(self, paths, reference=False, plan=None, deferred=False):
+        """Import, or reference, the given .ma/.mb files
+
+        Deferred references are created unloaded. Return a Result per
+        file, error is None on success.
+        """
+        if plan is None:
+            plan = self.plan(paths)
+        results = []
+        if not plan:
+            return results
+
+        cmds = self.cmds
+        cmds.undoInfo(openChunk=True, chunkName=UNDO_CHUNK)
+        cmds.refresh(suspend=True)
+        try:
+            for path, namespace in plan:
+                start = time.time()
+                error = None
+                try:
+                    self.load_file(path, namespace, reference, deferred)
+                except RuntimeError as ex:
+                    error = str(ex).strip() or 'Failed'
+                results.append(
+                    Result(path, namespace, time.time() - start, error))
+        finally:
+            cmds.refresh(suspend=False)
+            cmds.undoInfo(closeChunk=True)
+            cmds.refresh(force=True)
+        return results
@@ -0,0 +1,251 @@
+"""Compiled code cache for action scripts.
+
+Action buttons used to read and compile their script on every click.
+The cache keeps the compiled code object per script, keyed by path,
+mtime and size, so a repeated run goes straight to executing the
+cached bytecode. Least recently used entries are evicted once the
+cache holds more than `maxsize` scripts.
+
+Scripts living on a network share can additionally be backed by a
+`DiskCodeCache`: a per-user local folder of marshalled code objects,
+validated against the source's size, mtime and content hash. The first
+run of a new session then loads local bytecode instead of reading and
+compiling the source over the network.
+
+Usage:
+    >> cache = CodeCache(maxsize=32, disk=DiskCodeCache('C:/cache'))
+    >> exec(cache.get('G:/scripts/clean_scene.py'), namespace)
+    >> cache.stats()
+    {'hits': 0, 'misses': 1, 'evictions': 0, 'size': 1, 'maxsize': 32}
+"""
+
+import errno
+import hashlib
+import marshal
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+from .fileutil import file_stamp, replace
+
+try:
+    from importlib.util import MAGIC_NUMBER
+except ImportError:
+    # Python 2
+    import imp
+    MAGIC_NUMBER = imp.get_magic()
+
+# Extension of the files written by DiskCodeCache
+CACHE_EXT = '.crbc'
+
+
+def stat_key(path):
+    """Return (normalized path, mtime, size) of given filepath
+
+    Raises IOError when the file is missing, same as open() would.
+    """
+    path = os.path.normpath(path)
+    stamp = file_stamp(path)
+    if stamp is None:
+        raise IOError(errno.ENOENT, os.strerror(errno.ENOENT), path)
+    return (path,) + stamp
+
+
+def read_source(path):
+    with open(path, 'rb') as source_file:
+        return source_file.read()
+
+
+def compile_source(source, path):
+    return compile(source, path, 'exec', 0, True)
+
+
+def compile_file(path):
+    """Read and compile given Python filepath"""
+    return compile_source(read_source(path), path)
+
+
+class DiskCodeCache(object):
+    """Per-user folder of marshalled code objects
+
+    Each entry holds a header (Python magic, source path, mtime, size
+    and sha1 of the source) followed by the code object. An entry is
+    used as-is when mtime and size match. When only the mtime differs,
+    e.g. after the share was re-synced, the source is hashed and the
+    entry is reused if the content is unchanged.
+    """
+
+    def __init__(self, path, max_bytes=64 * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+
+    def _entry_path(self, source_path):
+        if not isinstance(source_path, bytes):
+            source_path = source_path.encode('utf-8')
+        name = hashlib.sha1(source_path).hexdigest()
+        return os.path.join(self.path, name + CACHE_EXT)
+
+    def load(self, key):
+        """Return the cached code object for given stat key, or None"""
+        entry_path = self._entry_path(key[0])
+        try:
+            with open(entry_path, 'rb') as entry_file:
+                header = marshal.load(entry_file)
+                if header[0] != MAGIC_NUMBER or header[1] != key[0]:
+                    return None
+                code = marshal.load(entry_file)
+        except (IOError, OSError, EOFError, ValueError, TypeError):
+            return None
+
+        if header[2:4] != key[1:3]:
+            if header[3] != key[2]:
+                return None
+            # Same size, different mtime: compare content
+            digest = hashlib.sha1(read_source(key[0])).hexdigest()
+            if digest != header[4]:
+                return None
+            self.store(key, code, digest)
+            return code
+
+        try:
+            os.utime(entry_path, None)  # Keep recently used entries on prune
+        except OSError:
+            pass
+        return code
+
+    def store(self, key, code, digest):
+        """Write code object of given stat key and source sha1"""
+        if not os.path.isdir(self.path):
+            try:
+                os.makedirs(self.path)
+            except OSError:
+                return
+        header = (MAGIC_NUMBER, key[0], key[1], key[2], digest)
+        fd, tmp_path = tempfile.mkstemp(suffix='.tmp', dir=self.path)
+        try:
+            with os.fdopen(fd, 'wb') as tmp_file:
+                marshal.dump(header, tmp_file)
+                marshal.dump(code, tmp_file)
+            replace(tmp_path, self._entry_path(key[0]))
+        except (IOError, OSError, ValueError):
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+        self.prune()
+
+    def _entries(self):
+        entries = []
+        if not os.path.isdir(self.path):
+            return entries
+        for name in os.listdir(self.path):
+            if not name.endswith(CACHE_EXT):
+                continue
+            entry_path = os.path.join(self.path, name)
+            try:
+                st = os.stat(entry_path)
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, entry_path))
+        return entries
+
+    def size(self):
+        """Return the total size of the cache folder in bytes"""
+        return sum(entry[1] for entry in self._entries())
+
+    def prune(self):
+        """Remove least recently used entries until under max_bytes"""
+        entries = sorted(self._entries())
+        total = sum(entry[1] for entry in entries)
+        while entries and total > self.max_bytes:
+            mtime, size, entry_path = entries.pop(0)
+            try:
+                os.remove(entry_path)
+            except OSError:
+                continue
+            total -= size
+
+    def purge(self):
+        """Remove every entry, return the number of removed files"""
+        count = 0
+        for mtime, size, entry_path in self._entries():
+            try:
+                os.remove(entry_path)
+                count += 1
+            except OSError:
+                pass
+        return count
+
+
+class CodeCache(object):
+    """LRU cache of compiled code objects"""
+
+    def __init__(self, maxsize=32, disk=None):
+        self.maxsize = maxsize
+        self.disk = disk
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()  # stat key -> code object
+        self._keys = {}                # normalized path -> stat key
+        self._lock = threading.Lock()
+
+    def get(self, path):
+        """Return the compiled code object of given filepath"""
+        key = stat_key(path)
+        with self._lock:
+            code = self._entries.pop(key, None)
+            if code is not None:
+                self._entries[key] = code  # Mark as most recently used
+                self.hits += 1
+                return code
+
+        code = self._compile(key)
+
+        with self._lock:
+            self.misses += 1
+            stale = self._keys.get(key[0])
+            if stale is not None:
+                self._entries.pop(stale, None)
+            self._keys[key[0]] = key
+            self._entries[key] = code
+            while len(self._entries) > self.maxsize:
+                old_key, _ = self._entries.popitem(last=False)
+                self._keys.pop(old_key[0], None)
+                self.evictions += 1
+        return code
+
+    def _compile(self, key):
+        if self.disk is not None:
+            code = self.disk.load(key)
+            if code is not None:
+                return code
+
+        source = read_source(key[0])
+        code = compile_source(source, key[0])
+        if self.disk is not None:
+            self.disk.store(key, code, hashlib.sha1(source).hexdigest())
+        return code
+
+    def discard(self, path):
+        """Drop the cached code of given filepath"""
+        with self._lock:
+            key = self._keys.pop(os.path.normpath(path), None)
+            if key is not None:
+                self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._keys.clear()
+
+    def stats(self):
+        """Return hit/miss counters and current size"""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+            }
@@ -0,0 +1,189 @@
+"""In-memory store for the CRBTool JSON save files.
+
+Every slot lookup used to open and parse `save.json`/`cus_save.json`
+again. The store parses each file once and keeps the result until
+the file's mtime (or size) changes on disk.
+
+Changes are collected in memory and written back once, after a short
+debounce delay, by writing a temporary file next to the target and
+renaming it over the original. A half-written save file can therefore
+never replace a good one.
+
+Usage:
+    >> store = ConfigStore()
+    >> store.value('C:/CRBTool/save.json', 0)
+    u'G:/scripts/clean_scene.py'
+    >> with store.journal():
+    ..     store.set('C:/CRBTool/save.json', 'Action 1', '')
+    ..     store.set('C:/CRBTool/save.json', 'Action 2', '')
+"""
+
+import atexit
+import contextlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+from .fileutil import file_stamp, write_json_atomic
+
+# Seconds to wait for more changes before writing to disk
+FLUSH_DELAY = 0.5
+
+# Seconds to wait before writing again after a failed write
+RETRY_DELAY = 5.0
+
+
+class ConfigStore(object):
+    """Serve save file lookups from memory, reloading on mtime change"""
+
+    def __init__(self, flush_delay=FLUSH_DELAY):
+        self.flush_delay = flush_delay
+        self._cache = {}    # normalized path -> (stamp, OrderedDict)
+        self._dirty = OrderedDict()  # normalized path -> OrderedDict
+        self._journal = []  # (path, key, value) changes not yet on disk
+        self._depth = 0     # Nesting level of journal() blocks
+        self._timer = None
+        self._lock = threading.RLock()
+        atexit.register(self.flush)
+
+    def load(self, path):
+        """Return the parsed content of given JSON filepath
+
+        Pending, not yet flushed changes are included. The returned
+        OrderedDict is shared, treat it as read-only.
+        """
+        key = os.path.normpath(path)
+        with self._lock:
+            if key in self._dirty:
+                return self._dirty[key]
+
+            stamp = file_stamp(key)
+            cached = self._cache.get(key)
+            if cached is not None and cached[0] == stamp:
+                return cached[1]
+
+            with open(key, 'r') as load_file:
+                data = json.load(load_file, object_pairs_hook=OrderedDict)
+            self._cache[key] = (stamp, data)
+            return data
+
+    def exists(self, path):
+        """Return True if given filepath exists on disk or is pending"""
+        with self._lock:
+            if os.path.normpath(path) in self._dirty:
+                return True
+        return os.path.isfile(path)
+
+    def keys(self, path):
+        return list(self.load(path).keys())
+
+    def values(self, path):
+        return list(self.load(path).values())
+
+    def key(self, path, pos):
+        return self.keys(path)[pos]
+
+    def value(self, path, pos):
+        return self.values(path)[pos]
+
+    def set(self, path, key, value):
+        """Change one key of given file, written back on next flush"""
+        with self._lock:
+            data = OrderedDict(self.load(path))
+            data[key] = value
+            self._stage(path, data)
+            self._journal.append((path, key, value))
+            self._schedule()
+
+    def replace(self, path, data):
+        """Replace the whole content of given file, written back on next flush"""
+        with self._lock:
+            self._stage(path, OrderedDict(data))
+            self._journal.append((path, None, data))
+            self._schedule()
+
+    def _stage(self, path, data):
+        key = os.path.normpath(path)
+        self._dirty[key] = OrderedDict(sorted(data.items()))
+        self._cache.pop(key, None)
+
+    def discard(self, path):
+        """Drop pending changes and cached content of given file
+
+        Use before deleting a save file so that a later flush does
+        not write it back.
+        """
+        key = os.path.normpath(path)
+        with self._lock:
+            self._dirty.pop(key, None)
+            self._cache.pop(key, None)
+            self._journal = [entry for entry in self._journal
+                             if os.path.normpath(entry[0]) != key]
+
+    def invalidate(self, path=None):
+        """Forget cached content of given filepath, or of every file"""
+        with self._lock:
+            if path is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(os.path.normpath(path), None)
+
+    def pending(self):
+        """Return the journal of changes not written to disk yet"""
+        with self._lock:
+            return list(self._journal)
+
+    @contextlib.contextmanager
+    def journal(self):
+        """Group changes so that they reach the disk in a single write"""
+        with self._lock:
+            self._depth += 1
+            self._cancel()
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._depth -= 1
+                if self._depth == 0 and self._dirty:
+                    self._schedule()
+
+    def _cancel(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _schedule(self, delay=None):
+        self._cancel()
+        if self._depth:
+            return
+        delay = self.flush_delay if delay is None else delay
+        if delay <= 0:
+            self.flush()
+            return
+        self._timer = threading.Timer(delay, self.flush)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def flush(self):
+        """Write every pending change to disk now
+
+        A file that could not be written stays pending, with its
+        journal entries, and is written again after RETRY_DELAY.
+        """
+        with self._lock:
+            self._cancel()
+            failed = False
+            for path, data in list(self._dirty.items()):
+                try:
+                    write_json_atomic(path, data)
+                except (IOError, OSError) as ex:
+                    print('Could not save {}: {}'.format(path, ex))
+                    failed = True
+                    continue
+                del self._dirty[path]
+                self._cache[path] = (file_stamp(path), data)
+                self._journal = [entry for entry in self._journal
+                                 if os.path.normpath(entry[0]) != path]
+            if failed:
+                self._schedule(max(RETRY_DELAY, self.flush_delay))
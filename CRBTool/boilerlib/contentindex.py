@@ -0,0 +1,163 @@
+"""Full-text index over the contents of the listed action scripts.
+
+Every `.py` and `.mel` file is split into lowercase identifier tokens
+(`cmds.polyReduce(...)` gives `cmds` and `polyreduce`) and kept in an
+inverted index token -> files. Files are only read again when their
+mtime or size changed, and the token lists are persisted to a local
+JSON file, so a search never has to read the network share.
+
+A query matches the files containing every one of its words, a word
+matching any token it is part of (`reduce` finds `polyReduce`).
+
+Usage:
+    >> index = ContentIndex('C:/cache/contentindex.json')
+    >> index.sync(['G:/scripts/clean.py', 'G:/scripts/lod.mel'])
+    2
+    >> index.search('polyReduce')
+    ['G:/scripts/lod.mel']
+"""
+
+import os
+import re
+import threading
+
+from .fileutil import file_stamp, load_json, save_json
+
+# Extensions whose contents are indexed
+INDEXED_EXTS = ('.py', '.mel')
+
+# Larger files are indexed by name only
+MAX_FILE_SIZE = 2 * 1024 * 1024
+
+TOKEN_RE = re.compile(r'[A-Za-z_][A-Za-z0-9_]{2,}')
+
+
+def tokenize(text):
+    """Return the set of lowercase identifier tokens of text"""
+    return set(token.lower() for token in TOKEN_RE.findall(text))
+
+
+def read_tokens(path, size):
+    if size > MAX_FILE_SIZE:
+        return set()
+    with open(path, 'rb') as script_file:
+        return tokenize(script_file.read().decode('utf-8', 'replace'))
+
+
+class ContentIndex(object):
+    """Inverted index of script contents persisted between sessions"""
+
+    def __init__(self, path):
+        self.path = path
+        self._files = None   # normalized path -> (mtime, size, tokens)
+        self._postings = {}  # token -> set of normalized paths
+        self._lock = threading.RLock()
+        self._generation = 0
+
+    def _load(self):
+        if self._files is None:
+            self._files = {}
+            for path, (mtime, size, tokens) in load_json(self.path).items():
+                self._add(path, mtime, size, set(tokens))
+        return self._files
+
+    def _add(self, path, mtime, size, tokens):
+        self._files[path] = (mtime, size, tokens)
+        for token in tokens:
+            self._postings.setdefault(token, set()).add(path)
+
+    def _remove(self, path):
+        mtime, size, tokens = self._files.pop(path)
+        for token in tokens:
+            posting = self._postings.get(token)
+            if posting is not None:
+                posting.discard(path)
+                if not posting:
+                    del self._postings[token]
+
+    def __len__(self):
+        with self._lock:
+            return len(self._load())
+
+    def sync(self, paths, generation=None):
+        """Index the given files and drop every other one
+
+        Only files whose mtime or size changed are read. Return the
+        number of files added, updated or removed.
+        """
+        wanted = set(os.path.normpath(path) for path in paths
+                     if os.path.splitext(path)[1].lower() in INDEXED_EXTS)
+        with self._lock:
+            files = self._load()
+            changed = 0
+            for path in set(files) - wanted:
+                self._remove(path)
+                changed += 1
+            known = dict((path, files[path][:2]) for path in wanted
+                         if path in files)
+
+        for path in wanted:
+            if generation is not None and generation != self._generation:
+                break  # Superseded by a newer sync
+            stamp = file_stamp(path)
+            if stamp is not None and known.get(path) == stamp:
+                continue
+            try:
+                tokens = read_tokens(path, stamp[1]) if stamp else None
+            except (IOError, OSError):
+                tokens = None
+            with self._lock:
+                if path not in self._files and tokens is None:
+                    continue
+                if path in self._files:
+                    self._remove(path)
+                if tokens is not None:
+                    self._add(path, stamp[0], stamp[1], tokens)
+            changed += 1
+
+        if changed:
+            self.save()
+        return changed
+
+    def sync_async(self, paths, callback=None):
+        """Run sync on a background thread
+
+        A newer call stops the previous one. The callback is called with
+        the number of changed files from the background thread.
+        """
+        self._generation += 1
+
+        def run(generation):
+            changed = self.sync(paths, generation)
+            if callback is not None and generation == self._generation:
+                callback(changed)
+
+        thread = threading.Thread(target=run, args=(self._generation,))
+        thread.daemon = True
+        thread.start()
+
+    def search(self, query):
+        """Return the sorted paths of the files containing every query word"""
+        words = tokenize(query) or set(query.lower().split())
+        if not words:
+            return []
+        with self._lock:
+            self._load()
+            matches = None
+            for word in words:
+                found = set(self._postings.get(word, ()))
+                # Tokens containing the word, the vocabulary is small
+                for token, posting in self._postings.items():
+                    if word in token and token != word:
+                        found |= posting
+                matches = found if matches is None else matches & found
+                if not matches:
+                    return []
+        return sorted(matches)
+
+    def save(self):
+        """Write the index to disk"""
+        with self._lock:
+            stored = dict((path, [mtime, size, sorted(tokens)])
+                          for path, (mtime, size, tokens) in self._load().items())
+        save_json(self.path, stored, 'content index')
@@ -0,0 +1,61 @@
+"""Host application detection and lazily imported DCC modules.
+
+`MAYA`, `NUKE` and `STANDALONE` only need the modules every host loads
+at startup anyway (`maya.cmds`, `nuke`). Heavier modules such as
+`pymel.core` or `nukescripts` are exposed as stand-ins that import the
+real module on first attribute access, so a session that never needs
+pymel never pays for it.
+
+Usage:
+    >> from boilerlib.dcc import MAYA, pm
+    >> if MAYA:
+    ..     pm.cmds.file(query=True, sceneName=True)  # pymel imports here
+"""
+
+import importlib
+
+
+def _importable(name):
+    try:
+        importlib.import_module(name)
+    except ImportError:
+        return False
+    return True
+
+
+class LazyModule(object):
+    """Stand-in for a module, imported on first attribute access"""
+
+    def __init__(self, name):
+        self.__dict__['_name'] = name
+        self.__dict__['_module'] = None
+
+    def _load(self):
+        if self._module is None:
+            self.__dict__['_module'] = importlib.import_module(self._name)
+        return self._module
+
+    @property
+    def loaded(self):
+        return self._module is not None
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __setattr__(self, attr, value):
+        setattr(self._load(), attr, value)
+
+    def __repr__(self):
+        state = 'loaded' if self.loaded else 'not loaded'
+        return '<lazy module {!r} ({})>'.format(self._name, state)
+
+
+MAYA = _importable('maya.cmds')
+NUKE = _importable('nuke')
+STANDALONE = not MAYA and not NUKE
+
+cmds = LazyModule('maya.cmds')
+mel = LazyModule('maya.mel')
+pm = LazyModule('pymel.core')
+nuke = LazyModule('nuke')
+nukescripts = LazyModule('nukescripts')
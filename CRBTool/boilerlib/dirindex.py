@@ -0,0 +1,105 @@
+"""Persistent index of the Directory slot listings.
+
+Stores, per listed root, the mtime of every listed directory and every
+matching entry (name, extension, size, mtime) in a local JSON file. A
+root is revalidated with a single stat per listed directory: as long
+as the mtimes are unchanged no file was added, removed or renamed, and
+the stored listing is served as-is. Listings are kept together with
+the depth they were taken at; a different depth counts as not indexed.
+
+Sizes and mtimes of files modified in place are only refreshed with
+the next full listing of their directory.
+
+Usage:
+    >> index = DirIndex('C:/cache/dirindex.json')
+    >> index.entries('G:/scripts', 0)
+    [Entry(name=u'clean.py', ext=u'.py', size=812, mtime=1500000000.0)]
+    >> index.is_fresh('G:/scripts', 0)
+    True
+"""
+
+import os
+import threading
+
+from .dirscan import Entry
+from .fileutil import load_json, save_json
+
+
+def dir_mtime(root):
+    """Return the mtime of given directory, or None if missing"""
+    try:
+        return os.stat(root).st_mtime
+    except OSError:
+        return None
+
+
+class DirIndex(object):
+    """Directory listings persisted between sessions"""
+
+    def __init__(self, path):
+        self.path = path
+        self._roots = None  # normalized root -> {'depth':, 'dirs':, 'entries':}
+        self._lock = threading.RLock()
+
+    def _load(self):
+        if self._roots is None:
+            self._roots = load_json(self.path)
+        return self._roots
+
+    def _record(self, root, depth):
+        with self._lock:
+            record = self._load().get(os.path.normpath(root))
+        if record is None or record.get('depth') != depth or \
+                'dirs' not in record:
+            return None
+        return record
+
+    def entries(self, root, depth=0):
+        """Return the indexed entries of root, or None if not indexed"""
+        record = self._record(root, depth)
+        if record is None:
+            return None
+        return [Entry(*entry) for entry in record['entries']]
+
+    def dirs(self, root, depth=0):
+        """Return the relative paths of the indexed directories of root"""
+        record = self._record(root, depth)
+        return list(record['dirs']) if record is not None else []
+
+    def is_fresh(self, root, depth=0):
+        """Return True if root is indexed and no listed directory changed"""
+        record = self._record(root, depth)
+        if record is None:
+            return False
+        for rel, mtime in record['dirs'].items():
+            path = os.path.join(root, rel) if rel else root
+            if dir_mtime(path) != mtime:
+                return False
+        return True
+
+    def update(self, root, entries, dirs, depth=0):
+        """Store the listing of root
+
+        dirs maps the relative path of every listed directory to its
+        mtime when it was listed, see dirscan.iter_entries.
+        """
+        with self._lock:
+            self._load()[os.path.normpath(root)] = {
+                'depth': depth,
+                'dirs': dirs,
+                'entries': [list(entry) for entry in entries],
+            }
+
+    def remove(self, root):
+        with self._lock:
+            self._load().pop(os.path.normpath(root), None)
+
+    def roots(self):
+        with self._lock:
+            return list(self._load().keys())
+
+    def save(self):
+        """Write the index to disk"""
+        with self._lock:
+            roots = dict(self._load())
+        save_json(self.path, roots, 'directory index')
@@ -0,0 +1,245 @@
+"""Concurrent directory scanning for the Custom Action lists.
+
+Each configured directory is listed on its own pool thread with
+`os.scandir` (falling back to `os.listdir` on Python 2 without the
+`scandir` package). Names are matched against one precompiled regular
+expression for all script extensions, and matches are streamed back
+in chunks through Qt signals, so the combo boxes fill while the
+network share is still being read.
+
+When given a `dirindex.DirIndex`, a root whose directory mtime did not
+change is not listed again, and fresh listings are written back to
+the index.
+
+Scanners share one pool per worker count, kept in this module, so
+building the window again does not start new threads.
+
+Usage:
+    >> scanner = DirScanner(index=DirIndex('C:/cache/dirindex.json'))
+    >> scanner.found.connect(lambda gen, slot, entries: ...)
+    >> scanner.scan([(0, 'G:/scripts'), (1, 'G:/assets')])
+"""
+
+import fnmatch
+import os
+import re
+import threading
+from collections import namedtuple
+from multiprocessing.pool import ThreadPool
+
+from .Qt import QtCore
+
+try:
+    from os import scandir
+except ImportError:
+    try:
+        from scandir import scandir
+    except ImportError:
+        scandir = None
+
+# Files listed in the Custom Action tab
+SCRIPT_PATTERNS = ('*.ma', '*.py', '*.mel', '*.mb')
+
+# Entries are streamed to the UI in chunks of this size
+CHUNK_SIZE = 256
+
+Entry = namedtuple('Entry', 'name ext size mtime')
+
+_pools = {}  # workers -> ThreadPool shared by the scanners
+_pools_lock = threading.Lock()
+
+
+def compile_patterns(patterns):
+    """Return one regular expression matching any of the fnmatch patterns"""
+    flags = re.IGNORECASE if os.path.normcase('A') == 'a' else 0
+    return re.compile('|'.join(
+        '(?:{})'.format(fnmatch.translate(pattern)) for pattern in patterns),
+        flags)
+
+
+SCRIPT_RE = compile_patterns(SCRIPT_PATTERNS)
+
+
+def _list_dir(path, pattern, want_dirs):
+    """Yield (name, is_dir, stat) of matching files and, if wanted, subdirs"""
+    if scandir is not None:
+        for dir_entry in scandir(path):
+            try:
+                if want_dirs and dir_entry.is_dir(follow_symlinks=False):
+                    yield dir_entry.name, True, None
+                    continue
+                if not pattern.match(dir_entry.name) or \
+                        not dir_entry.is_file():
+                    continue
+                st = dir_entry.stat()
+            except OSError:
+                continue
+            yield dir_entry.name, False, st
+    else:
+        for name in os.listdir(path):
+            full_path = os.path.join(path, name)
+            if want_dirs and os.path.isdir(full_path) and \
+                    not os.path.islink(full_path):
+                yield name, True, None
+                continue
+            if not pattern.match(name):
+                continue
+            try:
+                st = os.stat(full_path)
+            except OSError:
+                continue
+            yield name, False, st
+
+
+def iter_entries(root, pattern=SCRIPT_RE, max_depth=0, dirs=None):
+    """Yield an Entry for every file below root whose name matches pattern
+
+    Subdirectories are followed down to max_depth levels, 0 lists root
+    only. Entry names are relative to root and '/'-separated. When dirs
+    is a dict it receives the mtime of every listed directory, keyed by
+    its relative path ('' for root).
+    """
+    stack = [('', 0)]
+    while stack:
+        rel, depth = stack.pop()
+        path = os.path.join(root, rel) if rel else root
+        try:
+            if dirs is not None:
+                dirs[rel] = os.stat(path).st_mtime
+            listing = list(_list_dir(path, pattern, depth < max_depth))
+        except OSError:
+            if not rel:
+                raise
+            continue  # Unreadable subdirectory
+        subdirs = []
+        for name, is_dir, st in listing:
+            rel_name = rel + '/' + name if rel else name
+            if is_dir:
+                subdirs.append((rel_name, depth + 1))
+            else:
+                yield Entry(rel_name, os.path.splitext(name)[1].lower(),
+                            st.st_size, st.st_mtime)
+        # Depth-first, in listing order
+        stack.extend(reversed(subdirs))
+
+
+def list_entries(root, pattern=SCRIPT_RE, max_depth=0, dirs=None):
+    """Return a list of matching entries below root"""
+    return list(iter_entries(root, pattern, max_depth, dirs))
+
+
+def diff_entries(old, new):
+    """Return (added, removed, modified) entries between two listings
+
+    A rename shows up as one removed and one added entry.
+    """
+    old_by_name = dict((entry.name, entry) for entry in old)
+    new_by_name = dict((entry.name, entry) for entry in new)
+    added = [entry for name, entry in new_by_name.items()
+             if name not in old_by_name]
+    removed = [entry for name, entry in old_by_name.items()
+               if name not in new_by_name]
+    modified = [entry for name, entry in new_by_name.items()
+                if name in old_by_name and old_by_name[name] != entry]
+    return added, removed, modified
+
+
+def shared_pool(workers):
+    """Return the process-wide ThreadPool of given size"""
+    with _pools_lock:
+        if workers not in _pools:
+            _pools[workers] = ThreadPool(workers)
+        return _pools[workers]
+
+
+class DirScanner(QtCore.QObject):
+    """List several directories at the same time on a thread pool
+
+    Results carry the generation of the scan they belong to, so the
+    receiver can drop chunks of a scan that was superseded. `listing`
+    is emitted before the entries of a root that had to be listed
+    again; roots still matching the index only emit `done`.
+    """
+
+    listing = QtCore.Signal(int, int)        # generation, slot
+    found = QtCore.Signal(int, int, object)  # generation, slot, [Entry]
+    done = QtCore.Signal(int, int)           # generation, slot
+    error = QtCore.Signal(int, int, str)     # generation, slot, message
+    # slot, added, removed, modified [Entry], see refresh()
+    changed = QtCore.Signal(int, object, object, object)
+
+    def __init__(self, workers=3, index=None, max_depth=0, parent=None):
+        super(DirScanner, self).__init__(parent)
+        self.generation = 0
+        self.index = index
+        self.max_depth = max_depth
+        self._pool = shared_pool(workers)
+
+    def scan(self, roots):
+        """Start listing (slot, path) roots, return the scan generation"""
+        self.generation += 1
+        for slot, root in roots:
+            self._pool.apply_async(
+                self._scan_root, (self.generation, slot, root))
+        return self.generation
+
+    def refresh(self, slot, root):
+        """List one root again and emit `changed` with the difference
+
+        The difference is taken against the index, so the receiver can
+        update its list in place. Roots missing from the index get a
+        regular scan instead.
+        """
+        self._pool.apply_async(self._refresh_root, (slot, root))
+
+    def _refresh_root(self, slot, root):
+        old = None
+        if self.index is not None:
+            old = self.index.entries(root, self.max_depth)
+        if old is None:
+            self._scan_root(self.generation, slot, root)
+            return
+        dirs = {}
+        try:
+            new = list_entries(root, max_depth=self.max_depth, dirs=dirs)
+        except OSError as ex:
+            self.error.emit(self.generation, slot, str(ex))
+            return
+        self.index.update(root, new, dirs, self.max_depth)
+        self.index.save()
+        added, removed, modified = diff_entries(old, new)
+        if added or removed or modified:
+            self.changed.emit(slot, added, removed, modified)
+
+    def _scan_root(self, generation, slot, root):
+        if self.index is not None and \
+                self.index.is_fresh(root, self.max_depth):
+            self.done.emit(generation, slot)
+            return
+
+        self.listing.emit(generation, slot)
+
+        dirs = {}
+        entries = []
+        chunk = []
+        complete = True
+        try:
+            for entry in iter_entries(root, max_depth=self.max_depth,
+                                      dirs=dirs):
+                if generation != self.generation:
+                    return  # Superseded by a newer scan
+                entries.append(entry)
+                chunk.append(entry)
+                if len(chunk) >= CHUNK_SIZE:
+                    self.found.emit(generation, slot, chunk)
+                    chunk = []
+        except OSError as ex:
+            self.error.emit(generation, slot, str(ex))
+            complete = False
+        if chunk:
+            self.found.emit(generation, slot, chunk)
+
+        if self.index is not None and complete:
+            self.index.update(root, entries, dirs, self.max_depth)
+            self.index.save()
+        self.done.emit(generation, slot)
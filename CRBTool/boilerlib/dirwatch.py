@@ -0,0 +1,119 @@
+"""File system watcher for the Directory roots and Action files.
+
+Wraps `QFileSystemWatcher` and falls back to polling stamps on a timer
+for paths the watcher refuses (e.g. some network shares). Bursts of
+notifications for the same path are merged into one signal after a
+short delay.
+
+Usage:
+    >> watcher = DirWatcher()
+    >> watcher.dir_changed.connect(on_dir_changed)
+    >> watcher.set_dirs(['G:/scripts'])
+    >> watcher.set_files(['G:/scripts/clean.py'])
+"""
+
+import os
+
+from .Qt import QtCore
+from .fileutil import file_stamp
+
+# Milliseconds to wait for more notifications of a path
+SETTLE_DELAY = 300
+
+# Milliseconds between two polls of the fallback paths
+POLL_INTERVAL = 3000
+
+
+class DirWatcher(QtCore.QObject):
+    """Report changed directories and files"""
+
+    dir_changed = QtCore.Signal(str)
+    file_changed = QtCore.Signal(str)
+
+    def __init__(self, parent=None):
+        super(DirWatcher, self).__init__(parent)
+        self._dirs = set()
+        self._files = set()
+        self._polled = {}    # path -> stamp, for paths the watcher refused
+        self._pending = {}   # path -> signal to emit once settled
+
+        self._watcher = QtCore.QFileSystemWatcher(self)
+        self._watcher.directoryChanged.connect(self._on_dir)
+        self._watcher.fileChanged.connect(self._on_file)
+
+        self._settle_timer = QtCore.QTimer(self)
+        self._settle_timer.setSingleShot(True)
+        self._settle_timer.setInterval(SETTLE_DELAY)
+        self._settle_timer.timeout.connect(self._emit_pending)
+
+        self._poll_timer = QtCore.QTimer(self)
+        self._poll_timer.setInterval(POLL_INTERVAL)
+        self._poll_timer.timeout.connect(self._poll)
+
+    def set_dirs(self, paths):
+        """Watch exactly the given directories"""
+        self._dirs = self._sync(self._dirs, paths)
+
+    def set_files(self, paths):
+        """Watch exactly the given files"""
+        self._files = self._sync(self._files, paths)
+
+    def _sync(self, current, paths):
+        wanted = set(os.path.normpath(path) for path in paths if path)
+        for path in current - wanted:
+            if path in self._polled:
+                del self._polled[path]
+            else:
+                self._watcher.removePath(path)
+        watched = set(self._watcher.files()) | set(self._watcher.directories())
+        watched = set(os.path.normpath(path) for path in watched)
+        for path in wanted:
+            if path in watched or path in self._polled:
+                continue
+            if not os.path.exists(path):
+                # Deleted files come back through the poll
+                self._polled[path] = None
+                continue
+            # addPath returns False on Qt5, nothing on Qt4
+            if self._watcher.addPath(path) is False:
+                self._polled[path] = file_stamp(path)
+        if self._polled:
+            self._poll_timer.start()
+        else:
+            self._poll_timer.stop()
+        return wanted
+
+    def _on_dir(self, path):
+        self._pending[os.path.normpath(path)] = self.dir_changed
+        self._settle_timer.start()
+
+    def _on_file(self, path):
+        path = os.path.normpath(path)
+        self._pending[path] = self.file_changed
+        if not os.path.exists(path):
+            # The watcher drops deleted files, poll until they return
+            self._polled[path] = None
+            self._poll_timer.start()
+        self._settle_timer.start()
+
+    def _emit_pending(self):
+        pending, self._pending = self._pending, {}
+        for path, signal in pending.items():
+            signal.emit(path)
+
+    def _poll(self):
+        for path, stamp in list(self._polled.items()):
+            new_stamp = file_stamp(path)
+            if new_stamp == stamp:
+                continue
+            self._polled[path] = new_stamp
+            if path in self._dirs:
+                self._on_dir(path)
+            else:
+                self._on_file(path)
+            if new_stamp is not None and \
+                    self._watcher.addPath(path) is not False:
+                # Back on disk and watchable again
+                del self._polled[path]
+        if not self._polled:
+            self._poll_timer.stop()
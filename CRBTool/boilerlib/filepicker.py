@@ -0,0 +1,70 @@
+"""Pick several files of a Custom Action list for a batch import.
+
+A combo box popup closes on every click, so the files are picked in a
+dialog instead: a list view with extended selection (Shift/Ctrl+click)
+over the same `scriptmodel.ScriptListModel` the combo box shows. The
+picked files become the checked entries of the model.
+
+Usage:
+    >> picker = FilePicker(model, 'Directory 1', parent=window)
+    >> if picker.exec_():
+    ..     model.checked()
+"""
+
+from .Qt import QtCore, QtWidgets
+
+
+class FilePicker(QtWidgets.QDialog):
+    """Extended selection over a ScriptListModel, checked on accept"""
+
+    def __init__(self, model, title='Pick Files', parent=None):
+        super(FilePicker, self).__init__(parent)
+        self.model = model
+
+        self.setWindowTitle(title)
+        self.file_lv = QtWidgets.QListView(self)
+        self.file_lv.setSelectionMode(QtWidgets.QAbstractItemView.ExtendedSelection)
+        self.file_lv.setUniformItemSizes(True)
+        self.count_lb = QtWidgets.QLabel(self)
+        buttons = QtWidgets.QDialogButtonBox(self)
+        buttons.setStandardButtons(
+            QtWidgets.QDialogButtonBox.Ok | QtWidgets.QDialogButtonBox.Cancel)
+        self.clear_pb = buttons.addButton('Clear', QtWidgets.QDialogButtonBox.ResetRole)
+
+        layout = QtWidgets.QVBoxLayout(self)
+        layout.addWidget(self.file_lv)
+        layout.addWidget(self.count_lb)
+        layout.addWidget(buttons)
+
+        # Selection is the pick, hide the check indicators meanwhile
+        self.checkable = model.checkable
+        model.set_checkable(False)
+        self.file_lv.setModel(model)
+        selection = self.file_lv.selectionModel()
+        for name in model.checked():
+            row = model.row_of(name)
+            if row >= 0:
+                selection.select(model.index(row, 0), QtCore.QItemSelectionModel.Select)
+        self.update_count()
+
+        selection.selectionChanged.connect(self.update_count)
+        self.clear_pb.clicked.connect(self.file_lv.clearSelection)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        self.finished.connect(self.restore)
+
+    def picked(self):
+        """Return the names of the selected rows, in list order"""
+        rows = sorted(index.row() for index in self.file_lv.selectionModel().selectedRows())
+        return [self.model.data(self.model.index(row, 0)) for row in rows]
+
+    def update_count(self, *args):
+        self.count_lb.setText('{} file(s) picked'.format(
+            len(self.file_lv.selectionModel().selectedRows())))
+
+    def accept(self):
+        self.model.set_checked(self.picked())
+        super(FilePicker, self).accept()
+
+    def restore(self, result=None):
+        self.model.set_checkable(self.checkable)
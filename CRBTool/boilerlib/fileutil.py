@@ -0,0 +1,75 @@
+"""File helpers shared by the caches and indexes of boilerlib.
+
+Files are replaced atomically (written next to the target, then
+renamed over it), versions of a file are compared by their stat stamp
+(mtime and size), and the JSON caches are read and written the same
+way everywhere: a missing or broken cache reads as empty, a cache that
+cannot be written is reported and skipped.
+
+Usage:
+    >> file_stamp('G:/scripts/clean.py')
+    (1500000000.0, 812)
+    >> save_json('C:/cache/dirindex.json', roots, 'directory index')
+"""
+
+import json
+import os
+import tempfile
+
+
+def file_stamp(path):
+    """Return (mtime, size) of given filepath, or None if missing"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime, st.st_size)
+
+
+def replace(src, dst):
+    """Rename src over dst, also on Windows where os.rename refuses to"""
+    try:
+        os.replace(src, dst)
+    except AttributeError:
+        # Python 2 has no os.replace
+        if os.name == 'nt' and os.path.exists(dst):
+            os.remove(dst)
+        os.rename(src, dst)
+
+
+def write_json_atomic(path, data):
+    """Write data as JSON to a temporary file, then rename it over path"""
+    fd, tmp_path = tempfile.mkstemp(
+        prefix='.' + os.path.basename(path) + '.',
+        suffix='.tmp',
+        dir=os.path.dirname(path) or '.')
+    try:
+        with os.fdopen(fd, 'w') as tmp_file:
+            json.dump(data, tmp_file, sort_keys=True, indent=4)
+            tmp_file.flush()
+            os.fsync(tmp_file.fileno())
+        replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def load_json(path):
+    """Return the content of a JSON cache, {} if missing or broken"""
+    try:
+        with open(path, 'r') as cache_file:
+            return json.load(cache_file)
+    except (IOError, OSError, ValueError):
+        return {}
+
+
+def save_json(path, data, what):
+    """Write a JSON cache, creating its folder; failures are printed"""
+    folder = os.path.dirname(path)
+    try:
+        if folder and not os.path.isdir(folder):
+            os.makedirs(folder)
+        write_json_atomic(path, data)
+    except (IOError, OSError) as ex:
+        print('Could not save {}: {}'.format(what, ex))
@@ -0,0 +1,317 @@
+"""In-memory fuzzy search over the names listed in the Custom Action tab.
+
+Names and queries are lowercased and stripped of `_`, `-` and spaces,
+so `render light`, `render-light` and `renderlight` all find
+`render_light.py`. Names are indexed by the trigrams of that form, by
+the first one or two characters of every word, and in a sorted list of
+their base names.
+
+A query ranks names in tiers. Base names starting with the query are
+found by bisecting the sorted list and rank first; when they fill the
+result, only the shortest of them are scored. Otherwise the trigram
+postings are intersected (every trigram present), keeping the
+MAX_CANDIDATES shortest names, and, if that still finds too little,
+relaxed to names sharing at least half of the query's trigrams, seeded
+from the rarest trigrams within the same budget. Shortest names are
+picked through per-length sets of ids, never by sorting candidates,
+so a search stays around 10 ms with 100k names.
+
+Entries are grouped by a key (the Directory slot). Added names are
+queued and indexed on a background thread in chunks, so filling a list
+costs no indexing on the UI thread; names still queued are not found
+yet. Clearing a key drops its data at once.
+
+Usage:
+    >> index = FuzzyIndex()
+    >> index.add(0, ['clean_scene.py', 'export_abc.mel'])
+    >> index.wait()
+    >> index.search('scene_clean')
+    [(0.736, 0, 'clean_scene.py')]
+"""
+
+import bisect
+import heapq
+import itertools
+import re
+import threading
+
+try:
+    _chr = unichr  # Python 2, names and queries are unicode
+except NameError:
+    _chr = chr
+
+# Characters separating words in a file name
+WORD_RE = re.compile(r'[A-Za-z0-9]+')
+
+# Separators dropped from names and queries before matching
+SEPARATOR_RE = re.compile(r'[\s_\-]+')
+
+# Candidates scored per search and key at most
+MAX_CANDIDATES = 1000
+
+# Names indexed per lock hold of the background thread
+CHUNK_SIZE = 2000
+
+
+def normalize(text):
+    """Return text lowercased and without separators"""
+    return SEPARATOR_RE.sub('', text.lower())
+
+
+def trigrams(text):
+    return set(text[i:i + 3] for i in range(len(text) - 2))
+
+
+def is_subsequence(query, text):
+    it = iter(text)
+    return all(c in it for c in query)
+
+
+def _prepare(name):
+    """Return (name, normalized name, normalized base, trigrams, word prefixes)"""
+    lname = name.lower()
+    norm = normalize(lname)
+    prefixes = set()
+    for word in WORD_RE.findall(lname):
+        prefixes.add(word[:1])
+        prefixes.add(word[:2])
+    return (name, norm, normalize(lname.rsplit('/', 1)[-1]),
+            trigrams(norm), prefixes)
+
+
+class _Part(object):
+    """Index of the names of one key"""
+
+    def __init__(self):
+        self.queued = []     # Names waiting for the background thread
+        self.names = {}      # id -> (name, normalized name, normalized base)
+        self.ids = {}        # name -> id
+        self.grams = {}      # trigram -> set of ids
+        self.prefixes = {}   # 1-2 leading chars of a word -> set of ids
+        self.bases = []      # (normalized base, id), sorted on search
+        self.lengths = {}    # length of normalized name -> set of ids
+        self.sorted = True
+        self.next_id = 0
+        self.in_flight = set()  # Names being prepared off the lock
+        self.cancelled = set()  # Names of in_flight removed meanwhile
+
+    def take(self, size=None):
+        """Return queued names to prepare, marked as in flight"""
+        size = len(self.queued) if size is None else size
+        chunk = self.queued[:size]
+        del self.queued[:size]
+        self.in_flight.update(chunk)
+        return chunk
+
+    def insert(self, prepared):
+        for name, norm, base, grams, prefixes in prepared:
+            self.in_flight.discard(name)
+            if name in self.cancelled:
+                self.cancelled.discard(name)
+                continue
+            if name in self.ids:
+                continue
+            item_id = self.next_id
+            self.next_id += 1
+            self.names[item_id] = (name, norm, base)
+            self.ids[name] = item_id
+            for gram in grams:
+                self.grams.setdefault(gram, set()).add(item_id)
+            for token in prefixes:
+                self.prefixes.setdefault(token, set()).add(item_id)
+            self.bases.append((base, item_id))
+            self.lengths.setdefault(len(norm), set()).add(item_id)
+            self.sorted = False
+
+    def delete(self, names):
+        names = set(names)
+        self.queued = [name for name in self.queued if name not in names]
+        self.cancelled.update(names & self.in_flight)
+        removed = set()
+        for name in names:
+            item_id = self.ids.pop(name, None)
+            if item_id is None:
+                continue
+            removed.add(item_id)
+            name, norm, base = self.names.pop(item_id)
+            _discard(self.lengths, len(norm), item_id)
+            for gram in trigrams(norm):
+                _discard(self.grams, gram, item_id)
+            for word in WORD_RE.findall(name.lower()):
+                _discard(self.prefixes, word[:1], item_id)
+                _discard(self.prefixes, word[:2], item_id)
+        if removed:
+            self.bases = [base for base in self.bases if base[1] not in removed]
+
+    def sort(self):
+        if not self.sorted:
+            self.bases.sort()
+            self.sorted = True
+
+    def base_matches(self, query):
+        """Return the ids whose base starts with query"""
+        self.sort()
+        first = bisect.bisect_left(self.bases, (query,))
+        # First string sorting after every string starting with query
+        end = bisect.bisect_left(self.bases, (query[:-1] + _chr(ord(query[-1]) + 1),))
+        return set(item_id for base, item_id in self.bases[first:end])
+
+    def shortest(self, ids, limit):
+        """Return at most limit of ids, the shortest names first"""
+        if len(ids) <= limit:
+            return ids
+        found = []
+        for length in sorted(self.lengths):
+            found.extend(ids & self.lengths[length])
+            if len(found) >= limit:
+                break
+        return found[:limit]
+
+    def candidates(self, query, limit):
+        """Return {id: share of the query's trigrams found in the name}"""
+        base_ids = self.base_matches(query)
+        if len(base_ids) >= limit:
+            # Nothing else scores as high, the shortest score best
+            return dict.fromkeys(self.shortest(base_ids, limit), 1.0)
+        candidates = dict.fromkeys(base_ids, 1.0)
+        budget = MAX_CANDIDATES - len(candidates)
+
+        if len(query) < 3:
+            posting = self.prefixes.get(query, set())
+            candidates.update(dict.fromkeys(self.shortest(posting - base_ids, budget), 1.0))
+            return candidates
+
+        grams = trigrams(query)
+        postings = sorted((self.grams.get(gram, set()) for gram in grams), key=len)
+        # Strict: every trigram present, intersected length by length so
+        # the shortest matches are found without intersecting everything
+        for length in sorted(self.lengths):
+            if length < len(query) or budget <= 0:
+                continue
+            strict = self.lengths[length].intersection(*postings) - base_ids
+            strict = list(strict)[:budget]
+            candidates.update(dict.fromkeys(strict, 1.0))
+            budget -= len(strict)
+        if len(candidates) >= limit:
+            return candidates
+        budget = MAX_CANDIDATES - len(candidates)
+
+        # Relaxed: names sharing at least half of the query's trigrams.
+        # Such a name is in one of the len - need + 1 rarest postings;
+        # seeds are taken from the rarest first, up to the budget.
+        need = max(1, len(grams) // 2)
+        seeds = set()
+        for posting in postings[:len(postings) - need + 1]:
+            seeds.update(itertools.islice(posting, budget - len(seeds)))
+            if len(seeds) >= budget:
+                break
+        total = float(len(grams))
+        for item_id in seeds:
+            if item_id in candidates:
+                continue
+            count = sum(1 for posting in postings if item_id in posting)
+            if count >= need:
+                candidates[item_id] = count / total
+        return candidates
+
+
+def _discard(table, token, item_id):
+    posting = table.get(token)
+    if posting is not None:
+        posting.discard(item_id)
+        if not posting:
+            del table[token]
+
+
+class FuzzyIndex(object):
+    """Trigram, word-prefix and base-name index of names, per key"""
+
+    def __init__(self):
+        self._parts = {}  # key -> _Part
+        self._lock = threading.RLock()
+        self._thread = None
+
+    def __len__(self):
+        with self._lock:
+            return sum(len(part.names) + len(part.queued)
+                       for part in self._parts.values())
+
+    def _part(self, key):
+        part = self._parts.get(key)
+        if part is None:
+            part = self._parts[key] = _Part()
+        return part
+
+    def add(self, key, names):
+        """Queue names for indexing under key, indexed names are skipped"""
+        if not names:
+            return
+        with self._lock:
+            self._part(key).queued.extend(names)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._index_queued)
+                self._thread.daemon = True
+                self._thread.start()
+
+    def _index_queued(self):
+        while True:
+            with self._lock:
+                for key, part in self._parts.items():
+                    if part.queued:
+                        break
+                else:
+                    for part in self._parts.values():
+                        part.sort()
+                    self._thread = None
+                    return
+                chunk = part.take(CHUNK_SIZE)
+            prepared = [_prepare(name) for name in chunk]
+            with self._lock:
+                if self._parts.get(key) is part:  # Not cleared meanwhile
+                    part.insert(prepared)
+
+    def wait(self):
+        """Index the queued names now, in the calling thread"""
+        with self._lock:
+            for part in self._parts.values():
+                if part.queued:
+                    part.insert([_prepare(name) for name in part.take()])
+                part.sort()
+            thread = self._thread
+        if thread is not None:
+            thread.join()  # Finishes the chunk it is preparing
+
+    def remove(self, key, names):
+        """Drop names indexed or queued under key"""
+        with self._lock:
+            part = self._parts.get(key)
+            if part is not None:
+                part.delete(names)
+
+    def clear(self, key=None):
+        """Drop every name, or every name indexed under key"""
+        with self._lock:
+            if key is None:
+                self._parts.clear()
+            else:
+                self._parts.pop(key, None)
+
+    def search(self, query, limit=20):
+        """Return up to limit (score, key, name) matches, best first"""
+        query = normalize(query)
+        if not query:
+            return []
+        scored = []
+        with self._lock:
+            for key, part in self._parts.items():
+                for item_id, score in part.candidates(query, limit).items():
+                    name, norm, base = part.names[item_id]
+                    if base.startswith(query):
+                        score += 2.0
+                    elif query in norm:
+                        score += 1.0
+                    elif is_subsequence(query, base):
+                        score += 0.5
+                    # Prefer short names among equal matches
+                    scored.append((score - len(name) * 0.001, key, name))
+        return heapq.nlargest(limit, scored)
@@ -0,0 +1,137 @@
+"""Host window and widget lookup for the Maya and Nuke helpers.
+
+Maya's main window is resolved from its pointer through
+`OpenMayaUI.MQtUtil` and Nuke's among the top-level widgets only;
+both are cached while their C++ object lives. Tool windows register
+themselves here, so finding them again never walks every widget of
+the application.
+
+The registry lives in this module, so it survives a reload of the tool.
+
+Usage:
+    >> window = Boilerplate(parent=maya_main_window())
+    >> register(window)
+    >> registered('crb_tool')
+    [<Boilerplate ...>]
+"""
+
+import importlib
+
+from .Qt import QtCompat, QtWidgets
+
+# Class name of Nuke's main window
+NUKE_MAIN_WINDOW_CLASS = 'Foundry::UI::DockMainWindow'
+
+_cache = {}    # host name -> main window
+_windows = []  # registered tool windows
+
+
+def _wrapper_module():
+    binding = QtCompat.__binding__
+    if binding == 'PySide2':
+        try:
+            import shiboken2 as shiboken
+        except ImportError:
+            from PySide2 import shiboken2 as shiboken
+        return shiboken
+    if binding == 'PySide':
+        try:
+            import shiboken
+        except ImportError:
+            from PySide import shiboken
+        return shiboken
+    try:
+        import sip
+    except ImportError:
+        sip = importlib.import_module(binding + '.sip')
+    return sip
+
+
+def wrap_pointer(pointer, base=QtWidgets.QWidget):
+    """Return the Qt object at given C++ pointer as an instance of base"""
+    module = _wrapper_module()
+    if hasattr(module, 'wrapInstance'):
+        return module.wrapInstance(int(pointer), base)
+    return module.wrapinstance(int(pointer), base)
+
+
+def is_valid(obj):
+    """Return False once the C++ object of obj was deleted"""
+    if obj is None:
+        return False
+    try:
+        module = _wrapper_module()
+    except ImportError:
+        return True
+    if hasattr(module, 'isValid'):
+        return module.isValid(obj)
+    return not module.isdeleted(obj)
+
+
+def _cached(host, find):
+    window = _cache.get(host)
+    if not is_valid(window):
+        window = _cache[host] = find()
+    return window
+
+
+def _find_maya_main_window():
+    try:
+        from maya import OpenMayaUI
+        pointer = OpenMayaUI.MQtUtil.mainWindow()
+    except ImportError:
+        pointer = None
+    if pointer is not None:
+        return wrap_pointer(pointer, QtWidgets.QMainWindow)
+    for obj in QtWidgets.QApplication.topLevelWidgets():
+        if obj.objectName() == 'MayaWindow':
+            return obj
+    raise RuntimeError('Could not find MayaWindow instance')
+
+
+def _find_nuke_main_window():
+    for obj in QtWidgets.QApplication.topLevelWidgets():
+        if (obj.inherits('QMainWindow') and
+                obj.metaObject().className() == NUKE_MAIN_WINDOW_CLASS):
+            return obj
+    raise RuntimeError('Could not find DockMainWindow instance')
+
+
+def maya_main_window():
+    """Return Maya's main window"""
+    return _cached('maya', _find_maya_main_window)
+
+
+def nuke_main_window():
+    """Return Nuke's main window"""
+    return _cached('nuke', _find_nuke_main_window)
+
+
+def register(window):
+    """Remember a tool window for registered()"""
+    if window not in _windows:
+        _windows.append(window)
+
+
+def registered(object_name=None):
+    """Return the live registered windows, optionally by object name"""
+    _windows[:] = [window for window in _windows if is_valid(window)]
+    return [window for window in _windows
+            if object_name is None or window.objectName() == object_name]
+
+
+def set_zero_margins(widget, levels=3):
+    """Remove the margins Nuke puts around a docked panel
+
+    Only the children of the panel's container ancestors are touched,
+    see https://gist.github.com/maty974/4739917
+    """
+    parent = widget.parentWidget()
+    ancestor = parent.parentWidget() if parent is not None else None
+    for _ in range(levels):
+        if ancestor is None:
+            break
+        for child in ancestor.children():
+            if hasattr(child, 'setContentsMargins'):
+                child.setContentsMargins(0, 0, 0, 0)
+        ancestor = ancestor.parentWidget()
@@ -0,0 +1,80 @@
+"""Shared icons of the boilerdata/icons folder.
+
+Each icon file is decoded once per process, together with its
+high-DPI variant (`add@2x.png` next to `add.png`) when there is one,
+and the same `QIcon` instance is handed out on every request. Swapping
+the icon of a button is then a dictionary lookup, no file is read.
+
+Registries are kept per folder in this module, so they survive a
+reload of the tool.
+
+Usage:
+    >> icons = registry('C:/CRBTool/boilerdata/icons')
+    >> button.setIcon(icons.icon('add'))
+"""
+
+import os
+import threading
+
+from .Qt import QtGui
+
+# Suffixes of the high-DPI variants, with their device pixel ratio
+HIDPI_SUFFIXES = (('@2x', 2.0),)
+
+_registries = {}
+_lock = threading.Lock()
+
+
+class IconRegistry(object):
+    """Decoded pixmaps and shared icons of one folder"""
+
+    def __init__(self, folder):
+        self.folder = folder
+        self._icons = {}    # name -> QIcon
+        self._pixmaps = {}  # file name -> QPixmap
+
+    def _file_name(self, name):
+        return name if os.path.splitext(name)[1] else name + '.png'
+
+    def pixmap(self, name):
+        """Return the decoded QPixmap of the icon file of given name"""
+        file_name = self._file_name(name)
+        pixmap = self._pixmaps.get(file_name)
+        if pixmap is None:
+            pixmap = QtGui.QPixmap(os.path.join(self.folder, file_name))
+            self._pixmaps[file_name] = pixmap
+        return pixmap
+
+    def icon(self, name):
+        """Return the shared QIcon of given name, e.g. 'add' or 'add.png'"""
+        file_name = self._file_name(name)
+        icon = self._icons.get(file_name)
+        if icon is not None:
+            return icon
+
+        icon = QtGui.QIcon()
+        icon.addPixmap(self.pixmap(file_name))
+        base, ext = os.path.splitext(file_name)
+        for suffix, ratio in HIDPI_SUFFIXES:
+            variant = base + suffix + ext
+            if not os.path.isfile(os.path.join(self.folder, variant)):
+                continue
+            pixmap = self.pixmap(variant)
+            if hasattr(pixmap, 'setDevicePixelRatio'):  # Qt 5
+                pixmap.setDevicePixelRatio(ratio)
+            icon.addPixmap(pixmap)
+        self._icons[file_name] = icon
+        return icon
+
+    def clear(self):
+        self._icons.clear()
+        self._pixmaps.clear()
+
+
+def registry(folder):
+    """Return the IconRegistry of given folder, shared per process"""
+    folder = os.path.normpath(folder)
+    with _lock:
+        if folder not in _registries:
+            _registries[folder] = IconRegistry(folder)
+        return _registries[folder]
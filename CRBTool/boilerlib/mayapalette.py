@@ -1,63 +1,214 @@
+"""Maya palette themes: capture, compile and apply.
+
+Themes are JSON files mapping 'Role:Group' to an RGBA integer, named
+`qpalette_maya<version>.json`. `compile_palette` turns a theme into a
+`QPalette` once and caches it per Qt binding as a `QDataStream` blob,
+rebuilt only when the JSON file changes. A theme is applied to the
+whole QApplication, or only to one window and its children.
+
+The capture helpers in utils/ use `palette_to_dict` and `write_json`.
+
+Usage:
+    >> path = pick_theme('C:/CRBTool/boilerdata', '2017')  # maya2016 theme
+    >> set_maya_palette_with_tweaks(path, widget=window, cache_dir='C:/cache/palette')
+"""
+
 import json
+import os
+import re
+
+from .Qt import QtCompat, QtCore, QtGui, QtWidgets
+
+GROUPS = ['Disabled', 'Active', 'Inactive', 'Normal']
+ROLES = [
+        'AlternateBase',
+        'Background',
+        'Base',
+        'Button',
+        'ButtonText',
+        'BrightText',
+        'Dark',
+        'Foreground',
+        'Highlight',
+        'HighlightedText',
+        'Light',
+        'Link',
+        'LinkVisited',
+        'Mid',
+        'Midlight',
+        'Shadow',
+        'ToolTipBase',
+        'ToolTipText',
+        'Text',
+        'Window',
+        'WindowText'
+        ]
+
+THEME_RE = re.compile(r'qpalette_maya(\d+)\.json$')
+
+# Header of a compiled palette, followed by the QDataStream data
+BLOB_HEADER = 'crbpalette {} {}\n'
+
+
+def palette_from_dict(dct):
+    """Return a QPalette built from given dictionary"""
+    palette = QtGui.QPalette()
+    for role in ROLES:
+        try:
+            qRl = getattr(QtGui.QPalette, role)
+        except AttributeError:
+            continue  # Missing from the binding
+        for group in GROUPS:
+            color = dct.get('%s:%s' % (role, group))
+            if color is not None:
+                palette.setColor(getattr(QtGui.QPalette, group), qRl,
+                                 QtGui.QColor(color))
+    return palette
+
 
-from Qt import QtGui
-from Qt import QtWidgets
+def palette_to_dict(palette=None):
+    """Return the colors of palette, or of the QApplication, as a dictionary"""
+    if palette is None:
+        palette = QtWidgets.QApplication.palette()
+    result = {}
+    for role in ROLES:
+        for group in GROUPS:
+            qGrp = getattr(QtGui.QPalette, group)
+            qRl = getattr(QtGui.QPalette, role)
+            result['%s:%s' % (role, group)] = palette.color(qGrp, qRl).rgba()
+    return result
 
 
 def set_palette_from_dict(dct):
     """Set palette to current QApplication based on given dictionary"""
-    groups = ['Disabled', 'Active', 'Inactive', 'Normal']
-    roles = [
-            'AlternateBase',
-            'Background',
-            'Base',
-            'Button',
-            'ButtonText',
-            'BrightText',
-            'Dark',
-            'Foreground',
-            'Highlight',
-            'HighlightedText',
-            'Light',
-            'Link',
-            'LinkVisited',
-            'Mid',
-            'Midlight',
-            'Shadow',
-            'ToolTipBase',
-            'ToolTipText',
-            'Text',
-            'Window',
-            'WindowText'
-            ]
+    apply_palette(palette_from_dict(dct))
+
+
+def _blob_path(theme_path, cache_dir):
+    name = os.path.splitext(os.path.basename(theme_path))[0]
+    return os.path.join(cache_dir, '{}_{}.qpal'.format(
+        name, QtCompat.__binding__.lower()))
+
+
+def _theme_stamp(theme_path):
+    st = os.stat(theme_path)
+    return BLOB_HEADER.format(repr(st.st_mtime), st.st_size).encode('ascii')
+
+
+def _read_blob(blob_path, stamp):
+    try:
+        with open(blob_path, 'rb') as blob_file:
+            if blob_file.readline() != stamp:
+                return None
+            data = QtCore.QByteArray(blob_file.read())
+    except (IOError, OSError):
+        return None
     palette = QtGui.QPalette()
-    for role in roles:
-        try:
-            for group in groups:
-                color = QtGui.QColor(dct['%s:%s' % (role, group)])
-                qGrp = getattr(QtGui.QPalette, group)
-                qRl = getattr(QtGui.QPalette, role)
-                palette.setColor(qGrp, qRl, color)
-        except:
-            print('Could not use: ' + str(palette))
+    stream = QtCore.QDataStream(data)
+    stream >> palette
+    if stream.status() != QtCore.QDataStream.Ok:
+        return None
+    return palette
+
+
+def _write_blob(blob_path, stamp, palette):
+    data = QtCore.QByteArray()
+    stream = QtCore.QDataStream(data, QtCore.QIODevice.WriteOnly)
+    stream << palette
+    folder = os.path.dirname(blob_path)
+    if not os.path.isdir(folder):
+        os.makedirs(folder)
+    with open(blob_path, 'wb') as blob_file:
+        blob_file.write(stamp)
+        blob_file.write(data.data())
+
+
+def compile_palette(theme_path, cache_dir=None):
+    """Return the QPalette of a JSON theme, from the compiled cache if fresh"""
+    if cache_dir is None:
+        return palette_from_dict(read_json(theme_path))
+    blob_path = _blob_path(theme_path, cache_dir)
+    stamp = _theme_stamp(theme_path)
+    try:
+        palette = _read_blob(blob_path, stamp)
+    except Exception:  # Stream operators differ per binding
+        palette = None
+    if palette is not None:
+        return palette
+
+    palette = palette_from_dict(read_json(theme_path))
+    try:
+        _write_blob(blob_path, stamp, palette)
+    except Exception as ex:
+        print('Could not cache palette: {}'.format(ex))
+    return palette
+
+
+def pick_theme(folder, version=None):
+    """Return the theme of folder closest to, not newer than, version
+
+    Without a version, or with one older than every theme, the newest
+    or oldest theme is returned respectively.
+    """
+    themes = []
+    for name in os.listdir(folder):
+        match = THEME_RE.match(name)
+        if match:
+            themes.append((int(match.group(1)), os.path.join(folder, name)))
+    if not themes:
+        return None
+    themes.sort()
+    match = re.match(r'\d+', str(version or ''))
+    if match is None:
+        return themes[-1][1]
+    year = int(match.group())
+    older = [path for theme_year, path in themes if theme_year <= year]
+    return older[-1] if older else themes[0][1]
+
+
+def _scoped_widgets(widget):
+    return [widget] + widget.findChildren(QtWidgets.QWidget)
+
+
+def apply_palette(palette, widget=None):
+    """Set palette on the QApplication, or on widget and its children"""
+    if widget is not None:
+        widget.setPalette(palette)
+        return
     try:
         QtWidgets.QApplication.setPalette(palette)
-    except:
+    except Exception:
         print('Could not set palette: ' + str(palette))
 
 
-def set_style():
-    """Set style"""
-    available_styles = QtWidgets.QStyleFactory.keys()
-    if 'Fusion' in available_styles:
-        QtWidgets.QApplication.setStyle("Fusion")
-    elif 'Plastique' in available_styles:
-        QtWidgets.QApplication.setStyle("Plastique")
+def set_style(widget=None, preferred=None):
+    """Set style, on the QApplication or on widget and its children
 
+    The preferred style is used when the binding has it, else Fusion
+    (Qt 5) or Plastique (Qt 4).
+    """
+    available_styles = dict((key.lower(), key) for key in QtWidgets.QStyleFactory.keys())
+    for name in (preferred, 'Fusion', 'Plastique'):
+        if name and name.lower() in available_styles:
+            name = available_styles[name.lower()]
+            break
+    else:
+        return
+    if widget is None:
+        QtWidgets.QApplication.setStyle(name)
+        return
+    style = QtWidgets.QStyleFactory.create(name)
+    style.setParent(widget)  # Lives as long as the window
+    for child in _scoped_widgets(widget):
+        child.setStyle(style)
 
-def set_maya_tweaks():
+
+def set_maya_tweaks(widget=None):
     """Apply Maya-specific styling"""
-    base_palette = QtWidgets.QApplication.palette()
+    if widget is None:
+        base_palette = QtWidgets.QApplication.palette()
+    else:
+        base_palette = widget.palette()
 
     # Set custom colors
     LIGHT_COLOR = QtGui.QColor(100, 100, 100)
@@ -77,7 +228,12 @@ def set_maya_tweaks():
 
     # Set the new tweaked palette
     for name, palette in widget_palettes.items():
-        QtWidgets.QApplication.setPalette(palette, name)
+        if widget is None:
+            QtWidgets.QApplication.setPalette(palette, name)
+            continue
+        for child in _scoped_widgets(widget):
+            if child.inherits(name):
+                child.setPalette(palette)
 
 
 def read_json(filepath):
@@ -87,9 +243,17 @@ def read_json(filepath):
     return data
 
 
-def set_maya_palette_with_tweaks(palette_filepath):
-    """Apply styling to current QApplication"""
-    data = read_json(palette_filepath)
-    set_palette_from_dict(data)
-    set_style()
-    set_maya_tweaks()
+def write_json(data, filepath):
+    """Write given dictionary to JSON filepath"""
+    with open(filepath, 'w') as data_file:
+        json.dump(data, data_file, indent=2, sort_keys=True)
+
+
+def set_maya_palette_with_tweaks(palette_filepath, widget=None, cache_dir=None):
+    """Apply styling to current QApplication, or only to widget's tree
+
+    With a cache_dir the theme is loaded from its compiled palette.
+    """
+    apply_palette(compile_palette(palette_filepath, cache_dir), widget)
+    set_style(widget)
+    set_maya_tweaks(widget)
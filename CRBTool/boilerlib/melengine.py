@@ -0,0 +1,298 @@
+"""MEL execution engine for action scripts.
+
+Keeps the source of each MEL script in memory until its mtime or size
+changes, parses out its proc definitions, and evaluates several scripts
+in a single `mel.eval` call. Scripts that only define global procs are
+sourced once per file version.
+
+Each script body is wrapped in its own `{ }` block, so top-level
+variables of one script cannot clash with another's, while proc
+definitions are hoisted to the top level where MEL requires them.
+Timing of every script is measured inside Maya with `timerX`.
+
+Usage:
+    >> engine = MelEngine()
+    >> engine.run_batch(['G:/mel/a.mel', 'G:/mel/b.mel'])
+    [('G:/mel/a.mel', 0.01), ('G:/mel/b.mel', 0.2)]
+"""
+
+import re
+import threading
+
+from .codecache import stat_key
+
+# Matches a proc header in MEL source with strings and comments blanked
+PROC_RE = re.compile(
+    r'(?:\bglobal\s+)?\bproc\s+(?:[A-Za-z_]\w*(?:\s*\[\s*\])?\s+)?'
+    r'([A-Za-z_]\w*)\s*\(')
+
+BRACKETS = {'(': ')', '[': ']', '{': '}'}
+
+# Globals the timings of a batch are kept in
+BATCH_PREAMBLE = '''global float $gCRBMelTimes[];
+global float $gCRBMelStart;
+'''
+# MEL evaluated on its own ahead of a batch: resets the timings, so a
+# batch MEL refuses to run (parse error) reads back none, and defines
+# how they are read back
+BATCH_RESET = BATCH_PREAMBLE + '''clear($gCRBMelTimes);
+global proc float[] crbMelTimes()
+{
+    global float $gCRBMelTimes[];
+    return $gCRBMelTimes;
+}
+'''
+BATCH_START = '$gCRBMelStart = `timerX`;\n'
+BATCH_STOP = '$gCRBMelTimes[{}] = `timerX -st $gCRBMelStart`;\n'
+
+
+def blank(source):
+    """Return source with strings and comments replaced by spaces
+
+    The result has the same length and line breaks as the source, so
+    offsets found in it apply to the source. A list of
+    (line, message) errors for unterminated strings/comments is
+    returned alongside.
+    """
+    out = []
+    errors = []
+    i = 0
+    n = len(source)
+    line = 1
+    while i < n:
+        c = source[i]
+        if c == '"':
+            start_line = line
+            out.append('"')
+            i += 1
+            while i < n and source[i] != '"':
+                if source[i] == '\n':
+                    break
+                if source[i] == '\\' and i + 1 < n:
+                    out.append(' ')
+                    i += 1
+                out.append(' ')
+                i += 1
+            if i < n and source[i] == '"':
+                out.append('"')
+                i += 1
+            else:
+                errors.append((start_line, 'unterminated string'))
+        elif source.startswith('//', i):
+            end = source.find('\n', i)
+            end = n if end == -1 else end
+            out.append(' ' * (end - i))
+            i = end
+        elif source.startswith('/*', i):
+            end = source.find('*/', i + 2)
+            if end == -1:
+                errors.append((line, 'unterminated comment'))
+                end = n
+            else:
+                end += 2
+            chunk = source[i:end]
+            line += chunk.count('\n')
+            out.append(re.sub(r'[^\n]', ' ', chunk))
+            i = end
+        else:
+            if c == '\n':
+                line += 1
+            out.append(c)
+            i += 1
+    return ''.join(out), errors
+
+
+def check_brackets(code):
+    """Return (line, message) errors for unbalanced brackets
+
+    Expects code that went through blank() first.
+    """
+    errors = []
+    stack = []
+    line = 1
+    for c in code:
+        if c == '\n':
+            line += 1
+        elif c in BRACKETS:
+            stack.append((c, line))
+        elif c in ')]}':
+            if not stack:
+                errors.append((line, "unexpected '{}'".format(c)))
+            elif BRACKETS[stack[-1][0]] != c:
+                errors.append((line, "'{}' closed by '{}'".format(
+                    stack[-1][0], c)))
+                stack.pop()
+            else:
+                stack.pop()
+    for c, open_line in stack:
+        errors.append((open_line, "unclosed '{}'".format(c)))
+    return errors
+
+
+def scan(source):
+    """Return (line, message) syntax errors found in MEL source"""
+    code, errors = blank(source)
+    return errors + check_brackets(code)
+
+
+def split_procs(source):
+    """Split MEL source into proc definitions and top-level body
+
+    Returns (procs, body) where procs is a list of
+    (name, is_global, definition) tuples.
+    """
+    code, _ = blank(source)
+    procs = []
+    body = []
+    pos = 0
+    for match in PROC_RE.finditer(code):
+        if match.start() < pos:
+            continue  # Inside a proc we already consumed
+        brace = code.find('{', match.end())
+        if brace == -1:
+            break
+        depth = 0
+        end = brace
+        while end < len(code):
+            if code[end] == '{':
+                depth += 1
+            elif code[end] == '}':
+                depth -= 1
+                if depth == 0:
+                    break
+            end += 1
+        end += 1
+        start = match.start()
+        is_global = code[start:match.end()].lstrip().startswith('global')
+        body.append(source[pos:start])
+        procs.append((match.group(1), is_global, source[start:end]))
+        pos = end
+    body.append(source[pos:])
+    return procs, ''.join(body)
+
+
+class MelScript(object):
+    """Parsed MEL file at one version"""
+
+    def __init__(self, path, stamp, source):
+        self.path = path
+        self.stamp = stamp
+        self.source = source
+        self.procs, self.body = split_procs(source)
+
+    @property
+    def proc_names(self):
+        return [name for name, is_global, definition in self.procs
+                if is_global]
+
+    @property
+    def is_library(self):
+        """True if the file only defines procs"""
+        return not blank(self.body)[0].replace(';', '').strip()
+
+
+class MelEngine(object):
+    """Cache MEL sources and evaluate them in batches"""
+
+    def __init__(self, evaluator=None):
+        self._evaluator = evaluator
+        self._scripts = {}  # normalized path -> MelScript
+        self._sourced = {}  # normalized path -> stamp of sourced library
+        self._lock = threading.Lock()
+        self.last_timings = []
+
+    def _eval(self, command):
+        if self._evaluator is None:
+            import maya.mel
+            self._evaluator = maya.mel.eval
+        return self._evaluator(command)
+
+    def load(self, path):
+        """Return the MelScript of given filepath, reading disk on change"""
+        key = stat_key(path)
+        with self._lock:
+            script = self._scripts.get(key[0])
+            if script is not None and script.stamp == key[1:]:
+                return script
+
+        with open(key[0], 'r') as mel_file:
+            source = mel_file.read()
+        script = MelScript(key[0], key[1:], source)
+
+        with self._lock:
+            self._scripts[key[0]] = script
+        return script
+
+    def procs(self, path):
+        """Return the names of global procs defined by given filepath"""
+        return self.load(path).proc_names
+
+    def build_batch(self, scripts):
+        """Return the MEL command evaluating given MelScripts in order"""
+        parts = [BATCH_PREAMBLE]
+        for index, script in enumerate(scripts):
+            parts.append('// {}\n'.format(script.path.replace('\\', '/')))
+            parts.append(BATCH_START)
+            for name, is_global, definition in script.procs:
+                parts.append(definition + '\n')
+            parts.append('{\n' + script.body + '\n}\n')
+            parts.append(BATCH_STOP.format(index))
+        return ''.join(parts)
+
+    def run(self, path):
+        """Evaluate one MEL file, return its timing"""
+        return self.run_batch([path])
+
+    def run_batch(self, paths):
+        """Evaluate MEL files with a single mel.eval call
+
+        Returns a list of (path, seconds) for the scripts that ran.
+        Library files already sourced at their current version are
+        skipped.
+        """
+        scripts = []
+        for path in paths:
+            script = self.load(path)
+            if script.is_library and \
+                    self._sourced.get(script.path) == script.stamp:
+                continue
+            scripts.append(script)
+        if not scripts:
+            self.last_timings = []
+            return self.last_timings
+
+        self._eval(BATCH_RESET)
+        error = None
+        try:
+            self._eval(self.build_batch(scripts))
+        except RuntimeError as ex:
+            error = ex
+        try:
+            times = list(self._eval('crbMelTimes()') or [])[:len(scripts)]
+        except RuntimeError:
+            times = []
+
+        self.last_timings = list(zip(
+            [script.path for script in scripts], times))
+        for script in scripts[:len(times)]:
+            if script.is_library:
+                self._sourced[script.path] = script.stamp
+        self.report()
+
+        if error is not None:
+            failed = scripts[min(len(times), len(scripts) - 1)]
+            raise RuntimeError('MEL error in {}: {}'.format(failed.path, error))
+        return self.last_timings
+
+    def report(self):
+        """Print the timings of the last batch"""
+        total = sum(seconds for path, seconds in self.last_timings)
+        print('MEL batch: {} script(s) in {:.3f}s'.format(
+            len(self.last_timings), total))
+        for path, seconds in self.last_timings:
+            print('\t{:.3f}s  {}'.format(seconds, path))
+
+    def clear(self):
+        with self._lock:
+            self._scripts.clear()
+            self._sourced.clear()
@@ -0,0 +1,115 @@
+"""Startup phase timers.
+
+Phases are nested with `phase()`; each one is recorded with its path
+(`main/reload/qt`), its start relative to the outermost phase and its
+duration. When the outermost phase ends, the records are appended to a
+local log as JSON lines, one per phase, and optionally printed as a
+summary table.
+
+The records live in this module, so phases opened in crbMain, crbTool
+and the window share one timeline as long as both import it as
+`boilerlib.phasetimer`.
+
+Usage:
+    >> configure('C:/cache/phases.jsonl', summary=True)
+    >> with phase('main'):
+    ..     with phase('load_ui'):
+    ..         load()
+    main           0.512s  100.0%
+      load_ui      0.401s   78.3%
+"""
+
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+from functools import wraps
+
+_log_path = None
+_summary = False
+_stack = []    # Names of the open phases
+_records = []  # [path, depth, start, seconds] in start order
+_origin = None
+
+
+def configure(log_path=None, summary=False):
+    """Set the JSON lines log and whether to print a summary table"""
+    global _log_path, _summary
+    _log_path = log_path
+    _summary = summary
+
+
+@contextmanager
+def phase(name):
+    """Time the enclosed block as a phase nested in the open ones"""
+    global _origin
+    start = time.time()
+    if not _stack:
+        _origin = start
+    _stack.append(name)
+    record = ['/'.join(_stack), len(_stack) - 1, start - _origin, None]
+    _records.append(record)
+    try:
+        yield
+    finally:
+        record[3] = time.time() - start
+        _stack.pop()
+        if not _stack:
+            flush()
+
+
+def timed(name):
+    """Decorate a function to run as a phase"""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with phase(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def summary(records=None):
+    """Return the records as an indented table of durations"""
+    records = _records if records is None else records
+    total = sum(record[3] or 0.0 for record in records if record[1] == 0)
+    lines = []
+    width = max([len(record[0].rsplit('/', 1)[-1]) + 2 * record[1]
+                 for record in records] or [0])
+    for path, depth, start, seconds in records:
+        name = '  ' * depth + path.rsplit('/', 1)[-1]
+        seconds = seconds or 0.0
+        share = 100.0 * seconds / total if total else 0.0
+        lines.append('{:<{}}  {:7.3f}s  {:5.1f}%'.format(
+            name, width, seconds, share))
+    return '\n'.join(lines)
+
+
+def flush():
+    """Write, and print if configured, the finished records"""
+    records = list(_records)
+    del _records[:]
+    if not records:
+        return
+    if _summary:
+        print(summary(records))
+    if not _log_path:
+        return
+    session = _origin
+    try:
+        folder = os.path.dirname(_log_path)
+        if folder and not os.path.isdir(folder):
+            os.makedirs(folder)
+        with open(_log_path, 'a') as log_file:
+            for path, depth, start, seconds in records:
+                log_file.write(json.dumps({
+                    'session': round(session, 3),
+                    'host': os.path.basename(sys.executable),
+                    'phase': path,
+                    'depth': depth,
+                    'start': round(start, 6),
+                    'seconds': round(seconds or 0.0, 6),
+                }, sort_keys=True) + '\n')
+    except (IOError, OSError) as ex:
+        print('Could not write phase timings: {}'.format(ex))
@@ -0,0 +1,140 @@
+"""Preflight validation of action scripts.
+
+Checks that every configured script exists, is readable and parses:
+Python files are compiled, MEL files get a bracket/quote scan. Other
+files, such as scenes, are only checked for existence and one readable
+byte. Checks run on a thread pool and results are cached per file
+version (mtime and size), so a file is only checked again after it
+changed.
+
+Usage:
+    >> preflight = Preflight()
+    >> preflight.check(['G:/scripts/a.py'], callback=print)
+    >> preflight.result('G:/scripts/a.py').ok
+    True
+"""
+
+import os
+import threading
+from multiprocessing.pool import ThreadPool
+
+from . import melengine
+from .codecache import compile_source
+from .fileutil import file_stamp
+
+OK = 'ok'
+MISSING = 'missing'
+UNREADABLE = 'unreadable'
+SYNTAX = 'syntax'
+
+# Extensions whose source is read and parsed
+PARSED_EXTS = ('.py', '.mel')
+
+
+class Result(object):
+    """Outcome of checking one file"""
+
+    def __init__(self, path, status, message='', stamp=None):
+        self.path = path
+        self.status = status
+        self.message = message
+        self.stamp = stamp
+
+    @property
+    def ok(self):
+        return self.status == OK
+
+    def __repr__(self):
+        return 'Result({!r}, {!r}, {!r})'.format(
+            self.path, self.status, self.message)
+
+
+def check_file(path, stamp=None):
+    """Check given filepath, return a Result"""
+    path = os.path.normpath(path)
+    if stamp is None:
+        stamp = file_stamp(path)
+    if stamp is None or not os.path.isfile(path):
+        return Result(path, MISSING, 'File not found', stamp)
+
+    ext = os.path.splitext(path)[1].lower()
+    try:
+        with open(path, 'rb') as source_file:
+            # Scenes can be large and live on a share, one byte will do
+            source = source_file.read() if ext in PARSED_EXTS else source_file.read(1)
+    except (IOError, OSError) as ex:
+        return Result(path, UNREADABLE, str(ex), stamp)
+
+    if ext == '.py':
+        try:
+            compile_source(source, path)
+        except (SyntaxError, ValueError, TypeError) as ex:
+            line = getattr(ex, 'lineno', None)
+            return Result(path, SYNTAX, 'line {}: {}'.format(
+                line, getattr(ex, 'msg', ex)), stamp)
+    elif ext == '.mel':
+        errors = melengine.scan(source.decode('utf-8', 'replace'))
+        if errors:
+            return Result(path, SYNTAX, '; '.join(
+                'line {}: {}'.format(line, message)
+                for line, message in errors[:5]), stamp)
+    return Result(path, OK, '', stamp)
+
+
+class Preflight(object):
+    """Check files on a thread pool, caching results per file version"""
+
+    def __init__(self, workers=4):
+        self.workers = workers
+        self._pool = None
+        self._results = {}  # normalized path -> Result
+        self._lock = threading.Lock()
+
+    def _get_pool(self):
+        if self._pool is None:
+            self._pool = ThreadPool(self.workers)
+        return self._pool
+
+    def result(self, path):
+        """Return the cached Result of given filepath, or None"""
+        with self._lock:
+            return self._results.get(os.path.normpath(path))
+
+    def _check(self, path):
+        """Return (Result, True if it differs from the cached one)"""
+        path = os.path.normpath(path)
+        stamp = file_stamp(path)
+        with self._lock:
+            cached = self._results.get(path)
+        if cached is not None and cached.stamp == stamp and stamp is not None:
+            return cached, False
+        result = check_file(path, stamp)
+        with self._lock:
+            self._results[path] = result
+        changed = (cached is None or cached.status != result.status or
+                   cached.stamp != result.stamp)
+        return result, changed
+
+    def check_now(self, path):
+        """Check given filepath in the calling thread, using the cache"""
+        return self._check(path)[0]
+
+    def check(self, paths, callback=None):
+        """Check given filepaths on the pool
+
+        The callback is called from a worker thread with each Result
+        that is new or whose status or stamp changed; use result() for
+        the unchanged ones.
+        """
+        def done(outcome):
+            result, changed = outcome
+            if changed and callback is not None:
+                callback(result)
+
+        pool = self._get_pool()
+        for path in set(os.path.normpath(path) for path in paths if path):
+            pool.apply_async(self._check, (path,), callback=done)
+
+    def clear(self):
+        with self._lock:
+            self._results.clear()
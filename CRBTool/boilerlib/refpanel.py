@@ -0,0 +1,111 @@
+"""Load and unload the references of the open Maya scene on demand.
+
+Works together with the deferred reference mode of batchimport: heavy
+assets are referenced unloaded, and only the ones the artist needs are
+loaded here, alone or several at a time with viewport refresh
+suspended.
+
+Usage:
+    >> panel = ReferencePanel(parent=window)
+    >> panel.show()
+"""
+
+import os
+import time
+from collections import namedtuple
+
+from .Qt import QtCore, QtWidgets
+
+Reference = namedtuple('Reference', 'node path loaded')
+
+
+def list_references(cmds):
+    """Return a Reference per top-level reference of the scene"""
+    references = []
+    for path in cmds.file(query=True, reference=True) or []:
+        try:
+            node = cmds.referenceQuery(path, referenceNode=True)
+            loaded = cmds.referenceQuery(node, isLoaded=True)
+        except RuntimeError:
+            continue
+        references.append(Reference(node, path, bool(loaded)))
+    return references
+
+
+def set_loaded(cmds, nodes, loaded=True):
+    """Load or unload reference nodes, return [(node, seconds, error)]"""
+    results = []
+    cmds.refresh(suspend=True)
+    try:
+        for node in nodes:
+            start = time.time()
+            error = None
+            try:
+                if loaded:
+                    cmds.file(loadReference=node)
+                else:
+                    cmds.file(unloadReference=node)
+            except RuntimeError as ex:
+                error = str(ex).strip() or 'Failed'
+            results.append((node, time.time() - start, error))
+    finally:
+        cmds.refresh(suspend=False)
+        cmds.refresh(force=True)
+    return results
+
+
+class ReferencePanel(QtWidgets.QDialog):
+    """List of the scene references with Load/Unload buttons"""
+
+    def __init__(self, cmds=None, parent=None):
+        super(ReferencePanel, self).__init__(parent)
+        if cmds is None:
+            import maya.cmds as cmds
+        self.cmds = cmds
+        self.references = []
+
+        self.setWindowTitle('References')
+        self.ref_lw = QtWidgets.QListWidget(self)
+        self.ref_lw.setSelectionMode(QtWidgets.QAbstractItemView.ExtendedSelection)
+        self.load_pb = QtWidgets.QPushButton('Load', self)
+        self.unload_pb = QtWidgets.QPushButton('Unload', self)
+        self.refresh_pb = QtWidgets.QPushButton('Refresh', self)
+
+        button_layout = QtWidgets.QHBoxLayout()
+        button_layout.addWidget(self.load_pb)
+        button_layout.addWidget(self.unload_pb)
+        button_layout.addWidget(self.refresh_pb)
+        layout = QtWidgets.QVBoxLayout(self)
+        layout.addWidget(self.ref_lw)
+        layout.addLayout(button_layout)
+
+        self.load_pb.clicked.connect(lambda: self.set_selected_loaded(True))
+        self.unload_pb.clicked.connect(lambda: self.set_selected_loaded(False))
+        self.refresh_pb.clicked.connect(self.refresh)
+        self.ref_lw.itemDoubleClicked.connect(self.toggle_item)
+        self.refresh()
+
+    def refresh(self):
+        self.references = list_references(self.cmds)
+        self.ref_lw.clear()
+        for reference in self.references:
+            state = 'loaded' if reference.loaded else 'unloaded'
+            self.ref_lw.addItem('{}    ({}, {})'.format(
+                os.path.basename(reference.path), reference.node, state))
+
+    def selected(self):
+        return [self.references[self.ref_lw.row(item)]
+                for item in self.ref_lw.selectedItems()]
+
+    def set_selected_loaded(self, loaded):
+        nodes = [reference.node for reference in self.selected()
+                 if reference.loaded != loaded]
+        for node, seconds, error in set_loaded(self.cmds, nodes, loaded):
+            print('{} {}: {}'.format('LOAD' if loaded else 'UNLOAD', node,
+                                     error or '{:.3f}s'.format(seconds)))
+        self.refresh()
+
+    def toggle_item(self, item):
+        reference = self.references[self.ref_lw.row(item)]
+        set_loaded(self.cmds, [reference.node], not reference.loaded)
+        self.refresh()
@@ -0,0 +1,340 @@
+"""Header metadata of Maya scene files, read without opening them in Maya.
+
+`.ma` files are read up to their first `createNode`, collecting the
+`requires` statements (Maya version and plugins) and the `file -r`
+reference lines. `.mb` files are walked as IFF chunks (`FOR4`, or
+`FOR8` for 64-bit scenes) inside their header group, collecting the
+`VERS`, `PLUG` and `FREF` chunks. Both are read through a read-only
+memory map and never past a bounded prefix of the file.
+
+Headers are read on a process pool (thread pool inside a host that
+cannot start a Python interpreter) and cached by mtime and size in a
+local JSON file, written once per batch of reads.
+
+Usage:
+    >> index = HeaderIndex('C:/cache/sceneheaders.json')
+    >> header = index.read('G:/assets/tree.ma')
+    >> header.version, header.plugins
+    ('2018', [['mtoa', '2.0.1']])
+    >> problems(header, available=['mtoa'], maya_version='2017')
+    ['saved with Maya 2018']
+"""
+
+import mmap
+import os
+import re
+import struct
+import sys
+import threading
+from collections import namedtuple
+from contextlib import contextmanager
+from multiprocessing.pool import ThreadPool
+
+from .fileutil import file_stamp, load_json, save_json
+
+# Bytes of a .ma file searched for the end of its header
+MA_HEAD_SIZE = 4 * 1024 * 1024
+
+# Bytes of a .mb file walked for header chunks
+MB_HEAD_SIZE = 1024 * 1024
+
+Header = namedtuple('Header', 'path stamp version plugins references error')
+
+TOKEN_RE = re.compile(r'"((?:[^"\\]|\\.)*)"|(\S+)')
+
+# requires flags followed by a value
+REQUIRES_FLAGS = ('-nodeType', '-nt', '-dataType', '-dt')
+
+
+def _map_head(scene_file, size, stop=None):
+    """Return at most size leading bytes of an open file, up to stop"""
+    if os.fstat(scene_file.fileno()).st_size == 0:
+        return b''
+    mapped = mmap.mmap(scene_file.fileno(), 0, access=mmap.ACCESS_READ)
+    try:
+        end = mapped.find(stop, 0, size) if stop else -1
+        return mapped[:end if end >= 0 else size]
+    finally:
+        mapped.close()
+
+
+def _tokens(statement):
+    return [quoted if quoted or bare == '' else bare
+            for quoted, bare in TOKEN_RE.findall(statement)]
+
+
+def parse_ma(head):
+    """Return (version, plugins, references) of a .ma header"""
+    text = head.decode('utf-8', 'replace')
+    version = None
+    plugins = []
+    references = []
+    for statement in re.split(r';\s*\n', text):
+        # Drop comment lines ahead of the statement
+        statement = '\n'.join(line for line in statement.splitlines()
+                              if not line.lstrip().startswith('//'))
+        words = _tokens(statement)
+        if not words:
+            continue
+        if words[0] == 'requires':
+            args = []
+            skip = False
+            for word in words[1:]:
+                if skip:
+                    skip = False
+                elif word in REQUIRES_FLAGS:
+                    skip = True
+                elif not word.startswith('-'):
+                    args.append(word.rstrip(';'))
+            if len(args) >= 2 and args[0] == 'maya':
+                version = args[1]
+            elif args and args[0] != 'maya':
+                plugins.append([args[0], args[1] if len(args) > 1 else ''])
+        elif words[0] == 'file' and ('-r' in words or '-rdi' in words):
+            path = words[-1].rstrip(';')
+            if path not in references:
+                references.append(path)
+    return version, plugins, references
+
+
+def _strings(data):
+    return [part.decode('utf-8', 'replace')
+            for part in data.split(b'\0') if part]
+
+
+def parse_mb(head):
+    """Return (version, plugins, references) of a .mb header"""
+    if head[:4] == b'FOR8':
+        tag_size, size_fmt, align = 8, '>Q', 8
+    elif head[:4] == b'FOR4':
+        tag_size, size_fmt, align = 4, '>I', 4
+    else:
+        raise ValueError('Not a Maya binary file')
+    size_len = struct.calcsize(size_fmt)
+    version = None
+    plugins = []
+    references = []
+
+    # Walk the chunks of the outer 'Maya' form and of its groups
+    pos = tag_size + size_len + tag_size
+    end = len(head)
+    while pos + tag_size + size_len <= end:
+        tag = head[pos:pos + 4]
+        size = struct.unpack(size_fmt, head[pos + tag_size:pos + tag_size + size_len])[0]
+        data_start = pos + tag_size + size_len
+        if tag[:3] == b'FOR':
+            # Group, descend into its chunks
+            pos = data_start + tag_size
+            continue
+        data = head[data_start:data_start + size]
+        if tag == b'VERS':
+            version = ''.join(_strings(data)) or None
+        elif tag == b'PLUG':
+            strings = _strings(data)
+            if strings:
+                plugins.append([strings[0], strings[1] if len(strings) > 1 else ''])
+        elif tag == b'FREF':
+            for string in _strings(data):
+                if string.lower().endswith(('.ma', '.mb')) and string not in references:
+                    references.append(string)
+        pos = data_start + size
+        pos += (align - pos % align) % align
+    return version, plugins, references
+
+
+def read_header(path):
+    """Return the Header of given .ma/.mb file, errors are kept in it"""
+    stamp = file_stamp(path)
+    try:
+        ext = os.path.splitext(path)[1].lower()
+        with open(path, 'rb') as scene_file:
+            if ext == '.ma':
+                version, plugins, references = parse_ma(
+                    _map_head(scene_file, MA_HEAD_SIZE, b'\ncreateNode '))
+            else:
+                version, plugins, references = parse_mb(
+                    _map_head(scene_file, MB_HEAD_SIZE))
+    except (IOError, OSError, ValueError, struct.error) as ex:
+        return Header(path, None, None, [], [], str(ex))
+    return Header(path, stamp, version, plugins, references, None)
+
+
+def _version_year(version):
+    match = re.match(r'\d+', version or '')
+    return int(match.group()) if match else None
+
+
+def problems(header, available=None, maya_version=None):
+    """Return the reasons loading the scene of header would fail"""
+    if header.error:
+        return [header.error]
+    found = []
+    file_year = _version_year(header.version)
+    host_year = _version_year(maya_version)
+    if file_year and host_year and file_year > host_year:
+        found.append('saved with Maya {}'.format(header.version))
+    if available is not None:
+        available = set(name.lower() for name in available)
+        for name, version in header.plugins:
+            if name.lower() not in available:
+                found.append('requires plugin {} {}'.format(name, version).strip())
+    return found
+
+
+def available_plugins(loaded=()):
+    """Return the names of loaded plugins and plugins on MAYA_PLUG_IN_PATH"""
+    names = set(loaded)
+    for folder in os.environ.get('MAYA_PLUG_IN_PATH', '').split(os.pathsep):
+        try:
+            for name in os.listdir(folder):
+                base, ext = os.path.splitext(name)
+                if ext.lower() in ('.mll', '.so', '.bundle', '.py', '.pyc'):
+                    names.add(base)
+        except OSError:
+            continue
+    return names
+
+
+def pool_executable():
+    """Return the Python interpreter for worker processes, or None
+
+    Inside Maya, sys.executable is the application itself; its worker
+    processes are started with mayapy on Windows. Forking the host
+    application elsewhere is not safe, threads are used instead.
+    """
+    name = os.path.basename(sys.executable).lower()
+    if name.startswith(('python', 'mayapy')):
+        return sys.executable
+    if sys.platform == 'win32':
+        mayapy = os.path.join(os.path.dirname(sys.executable), 'mayapy.exe')
+        if os.path.isfile(mayapy):
+            return mayapy
+    return None
+
+
+@contextmanager
+def _executable(executable):
+    """Start the processes of the block with executable
+
+    multiprocessing keeps the interpreter in a module global, shared by
+    every tool of the host session; it is put back once the pool's
+    workers are started.
+    """
+    try:
+        from multiprocessing import spawn as module  # Python 3
+        previous = module.get_executable()
+    except ImportError:
+        from multiprocessing import forking as module  # Python 2
+        previous = getattr(module, '_python_exe', None)
+    set_executable = getattr(module, 'set_executable', None)
+    if set_executable is None or previous is None or previous == executable:
+        # Forking platforms of Python 2 start no interpreter
+        yield
+        return
+    set_executable(executable)
+    try:
+        yield
+    finally:
+        set_executable(previous)
+
+
+def make_pool(workers):
+    """Return a process pool, or a thread pool if no process can start"""
+    executable = pool_executable()
+    if executable is not None:
+        try:
+            import multiprocessing
+            with _executable(executable):
+                return multiprocessing.Pool(workers)
+        except (ImportError, OSError, ValueError) as ex:
+            print('Reading scene headers on threads: {}'.format(ex))
+    return ThreadPool(workers)
+
+
+class HeaderIndex(object):
+    """Scene headers cached by file version and persisted between sessions"""
+
+    def __init__(self, path, workers=2):
+        self.path = path
+        self.workers = workers
+        self._pool = None
+        self._headers = None  # normalized path -> Header
+        self._lock = threading.RLock()
+
+    def _load(self):
+        if self._headers is None:
+            self._headers = dict((path, Header(*header))
+                                 for path, header in load_json(self.path).items())
+        return self._headers
+
+    def cached(self, path):
+        """Return the cached Header of path if the file did not change"""
+        path = os.path.normpath(path)
+        with self._lock:
+            header = self._load().get(path)
+        if header is None or header.stamp is None:
+            return None
+        if file_stamp(path) != tuple(header.stamp):
+            return None
+        return header
+
+    def read(self, path):
+        """Return the Header of path, reading it in the calling thread"""
+        return self.read_all([path])[0]
+
+    def read_all(self, paths):
+        """Return the Headers of paths, read in the calling thread"""
+        headers = []
+        new = []
+        for path in paths:
+            header = self.cached(path)
+            if header is None:
+                header = read_header(os.path.normpath(path))
+                new.append(header)
+            headers.append(header)
+        if new:
+            self._store(new)
+        return headers
+
+    def _store(self, headers):
+        with self._lock:
+            cache = self._load()
+            for header in headers:
+                cache[header.path] = header
+        self.save()
+
+    def scan(self, paths, callback=None):
+        """Read the headers of changed .ma/.mb files in the background
+
+        Files are compared with the cache on a background thread, and
+        the changed ones read on the pool. The callback is called with
+        the list of new Headers from that thread once they are all read.
+        """
+        paths = [os.path.normpath(path) for path in set(paths)
+                 if os.path.splitext(path)[1].lower() in ('.ma', '.mb')]
+        if not paths:
+            return
+        thread = threading.Thread(target=self._scan, args=(paths, callback))
+        thread.daemon = True
+        thread.start()
+
+    def _scan(self, paths, callback):
+        stale = [path for path in paths if self.cached(path) is None]
+        if not stale:
+            return
+        with self._lock:
+            if self._pool is None:
+                self._pool = make_pool(self.workers)
+        # Worker processes send plain tuples back
+        headers = [Header(*header) for header in
+                   self._pool.map(read_header, stale, chunksize=8)]
+        self._store(headers)
+        if callback is not None:
+            callback(headers)
+
+    def save(self):
+        """Write the cache to disk"""
+        with self._lock:
+            stored = dict((path, list(header))
+                          for path, header in self._load().items())
+        save_json(self.path, stored, 'scene headers')
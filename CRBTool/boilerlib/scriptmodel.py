@@ -0,0 +1,193 @@
+"""Lazy list model behind the Custom Action combo boxes.
+
+Entries streamed in by the directory scanner are queued and only
+handed to the view a page at a time through `canFetchMore`/`fetchMore`,
+so opening a directory with tens of thousands of files costs one page
+of rows, not one `addItem` per file. No item objects are created per
+file; rows are served straight from the entry list. Names are kept in
+a set and visible rows in a name -> row dictionary, so membership,
+`row_of` and `set_icon` do not walk the list.
+
+Rows can be made checkable, so several files picked for a batch run
+(see filepicker) show as checked in the combo box.
+
+Given a `fuzzyindex.FuzzyIndex`, the model keeps the names it holds
+indexed under its key, so search follows every rescan.
+
+Usage:
+    >> model = ScriptListModel(search_index=FuzzyIndex(), key=0)
+    >> combo.setModel(model)
+    >> model.add_entries(entries)
+"""
+
+from .Qt import QtCore
+
+# Rows handed to the view per fetchMore call
+PAGE_SIZE = 200
+
+
+class ScriptListModel(QtCore.QAbstractListModel):
+    """Paged list of dirscan.Entry rows"""
+
+    def __init__(self, parent=None, search_index=None, key=None):
+        super(ScriptListModel, self).__init__(parent)
+        self.search_index = search_index
+        self.key = key
+        self._rows = []      # Entries visible to the view
+        self._pending = []   # Entries waiting for fetchMore
+        self._names = set()  # Names of every entry, visible or queued
+        self._row_of = {}    # name -> row of the visible entries
+        self._icons = {}     # name -> QIcon, e.g. preflight failures
+        self._checked = set()
+        self.checkable = False
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._rows)
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._rows):
+            return None
+        entry = self._rows[index.row()]
+        if role in (QtCore.Qt.DisplayRole, QtCore.Qt.EditRole):
+            return entry.name
+        if role == QtCore.Qt.DecorationRole:
+            return self._icons.get(entry.name)
+        if role == QtCore.Qt.CheckStateRole and self.checkable:
+            if entry.name in self._checked:
+                return QtCore.Qt.Checked
+            return QtCore.Qt.Unchecked
+        if role == QtCore.Qt.UserRole:
+            return entry
+        return None
+
+    def flags(self, index):
+        flags = super(ScriptListModel, self).flags(index)
+        if index.isValid() and self.checkable:
+            flags |= QtCore.Qt.ItemIsUserCheckable
+        return flags
+
+    def setData(self, index, value, role=QtCore.Qt.EditRole):
+        if not index.isValid():
+            return False
+        name = self._rows[index.row()].name
+        if role == QtCore.Qt.DecorationRole:
+            # QComboBox.setItemIcon ends up here
+            self._icons[name] = value
+        elif role == QtCore.Qt.CheckStateRole:
+            if value == QtCore.Qt.Checked:
+                self._checked.add(name)
+            else:
+                self._checked.discard(name)
+        else:
+            return False
+        self.dataChanged.emit(index, index)
+        return True
+
+    def _all_changed(self):
+        if self._rows:
+            self.dataChanged.emit(self.index(0, 0),
+                                  self.index(len(self._rows) - 1, 0))
+
+    def set_checkable(self, checkable):
+        """Show or hide the check indicators"""
+        if checkable != self.checkable:
+            self.checkable = checkable
+            self._all_changed()
+
+    def checked(self):
+        """Return the names of the checked entries, in list order"""
+        if not self._checked:
+            return []
+        return [entry.name for entry in self._rows + self._pending
+                if entry.name in self._checked]
+
+    def set_checked(self, names):
+        """Check exactly the entries of given names"""
+        self._checked = set(names) & self._names
+        self._all_changed()
+
+    def clear_checks(self):
+        self._checked = set()
+        self._all_changed()
+
+    def canFetchMore(self, parent=QtCore.QModelIndex()):
+        return not parent.isValid() and bool(self._pending)
+
+    def fetchMore(self, parent=QtCore.QModelIndex()):
+        if parent.isValid() or not self._pending:
+            return
+        page = self._pending[:PAGE_SIZE]
+        del self._pending[:PAGE_SIZE]
+        first = len(self._rows)
+        self.beginInsertRows(QtCore.QModelIndex(), first, first + len(page) - 1)
+        self._rows.extend(page)
+        for row, entry in enumerate(page, first):
+            self._row_of[entry.name] = row
+        self.endInsertRows()
+
+    def add_entries(self, entries):
+        """Queue entries, the first page is shown right away"""
+        self._pending.extend(entries)
+        self._names.update(entry.name for entry in entries)
+        if self.search_index is not None:
+            self.search_index.add(self.key, [entry.name for entry in entries])
+        if len(self._rows) < PAGE_SIZE:
+            self.fetchMore()
+
+    def remove_names(self, names):
+        """Remove entries by name, visible or still queued"""
+        names = set(names) & self._names
+        if not names:
+            return
+        self._names -= names
+        self._pending = [entry for entry in self._pending
+                         if entry.name not in names]
+        for row in sorted((self._row_of[name] for name in names
+                           if name in self._row_of), reverse=True):
+            self.beginRemoveRows(QtCore.QModelIndex(), row, row)
+            del self._rows[row]
+            self.endRemoveRows()
+        self._row_of = dict((entry.name, row)
+                            for row, entry in enumerate(self._rows))
+        for name in names:
+            self._icons.pop(name, None)
+        self._checked -= names
+        if self.search_index is not None:
+            self.search_index.remove(self.key, names)
+
+    def clear(self):
+        self.beginResetModel()
+        self._rows = []
+        self._pending = []
+        self._names = set()
+        self._row_of = {}
+        self._icons = {}
+        self._checked = set()
+        self.endResetModel()
+        if self.search_index is not None:
+            self.search_index.clear(self.key)
+
+    def names(self):
+        """Return the names of every entry, visible or still queued"""
+        return [entry.name for entry in self._rows + self._pending]
+
+    def row_of(self, name):
+        """Return the row of given name, fetching pages up to it, or -1"""
+        if name not in self._names:
+            return -1
+        while name not in self._row_of and self.canFetchMore():
+            self.fetchMore()
+        return self._row_of.get(name, -1)
+
+    def __contains__(self, name):
+        return name in self._names
+
+    def set_icon(self, name, icon):
+        """Decorate the entry of given name, wherever it is"""
+        self._icons[name] = icon
+        row = self._row_of.get(name)
+        if row is not None:
+            index = self.index(row, 0)
+            self.dataChanged.emit(index, index)
@@ -0,0 +1,77 @@
+"""Tooltips fetched on hover.
+
+An event filter answers `QEvent.ToolTip` by asking a provider for the
+widget's text, so nothing is read until a tooltip is shown. Sidecar
+text files (`clean.txt` next to `clean.py`) are cached and only read
+again when their mtime or size changes.
+
+Usage:
+    >> cache = SidecarCache()
+    >> tip_filter = TooltipFilter(lambda widget: cache.text('G:/s/clean.py'))
+    >> checkbox.installEventFilter(tip_filter)
+"""
+
+import io
+import os
+import threading
+
+from .Qt import QtCore, QtWidgets
+from .fileutil import file_stamp
+
+
+def sidecar_path(path):
+    """Return the path of the .txt file describing given file"""
+    return os.path.splitext(path)[0] + '.txt'
+
+
+class SidecarCache(object):
+    """Contents of sidecar .txt files, cached by file version"""
+
+    def __init__(self):
+        self._texts = {}  # sidecar path -> ((mtime, size), text)
+        self._lock = threading.Lock()
+
+    def text(self, path):
+        """Return the sidecar text of given file, or None without sidecar"""
+        sidecar = sidecar_path(path)
+        stamp = file_stamp(sidecar)
+        if stamp is None:
+            with self._lock:
+                self._texts.pop(sidecar, None)
+            return None
+        with self._lock:
+            cached = self._texts.get(sidecar)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        try:
+            with io.open(sidecar, 'r', encoding='utf-8',
+                         errors='replace') as sidecar_file:
+                text = sidecar_file.read()
+        except (IOError, OSError):
+            return None
+        with self._lock:
+            self._texts[sidecar] = (stamp, text)
+        return text
+
+    def clear(self):
+        with self._lock:
+            self._texts.clear()
+
+
+class TooltipFilter(QtCore.QObject):
+    """Show the text of provider(widget) when a tooltip is requested"""
+
+    def __init__(self, provider, parent=None):
+        super(TooltipFilter, self).__init__(parent)
+        self.provider = provider
+
+    def eventFilter(self, obj, event):
+        if event.type() != QtCore.QEvent.ToolTip:
+            return False
+        text = self.provider(obj)
+        if text:
+            QtWidgets.QToolTip.showText(event.globalPos(), text, obj)
+        else:
+            QtWidgets.QToolTip.hideText()
+            event.ignore()
+        return True
@@ -0,0 +1,134 @@
+"""Compiled .ui modules cached per Qt binding.
+
+`QtCompat.load_ui` parses the .ui XML with `QUiLoader`/`uic` every time
+a window is built. Here the .ui file is compiled once into a Python
+module with the binding's own compiler (`uic`, `pyside2uic` or
+`pysideuic`), kept in a cache folder next to the modules of the other
+bindings, and only compiled again when the .ui mtime or size changes.
+Widgets are then built by running the compiled `setupUi`.
+
+Like `load_ui`, the returned widget carries every named child as an
+attribute. Without a compiler for the binding the .ui file is loaded
+with `QtCompat.load_ui` as before.
+
+Usage:
+    >> window = load_ui('C:/CRBTool/boilerdata/crb_window.ui', 'C:/cache/ui')
+    >> window.action_pb.setText('Run')
+"""
+
+import os
+import re
+import tempfile
+
+from .Qt import QtCompat, QtWidgets
+from .codecache import compile_source
+from .fileutil import replace
+
+# First line of a compiled module: mtime, size and top widget class of
+# the .ui it was compiled from
+STAMP_LINE = '# crb-ui: {} {} {}\n'
+
+TOP_WIDGET_RE = re.compile(br'<widget\s+class="(\w+)"')
+
+
+def ui_stamp(ui_file):
+    st = os.stat(ui_file)
+    return [repr(st.st_mtime), str(st.st_size)]
+
+
+def read_stamp(path):
+    """Return (mtime, size, widget class) recorded in a compiled module"""
+    try:
+        with open(path, 'rb') as module_file:
+            words = module_file.readline().decode('utf-8').split()
+    except (IOError, OSError, UnicodeDecodeError):
+        return None
+    if len(words) != 5 or words[1] != 'crb-ui:':
+        return None
+    return words[2:]
+
+
+def module_path(ui_file, cache_dir):
+    """Return the compiled module path of ui_file for the current binding"""
+    name = os.path.splitext(os.path.basename(ui_file))[0]
+    return os.path.join(cache_dir, '{}_{}.py'.format(
+        name, QtCompat.__binding__.lower()))
+
+
+def _compiler():
+    """Return the compileUi function of the current binding, or None"""
+    binding = QtCompat.__binding__
+    try:
+        if binding == 'PyQt5':
+            from PyQt5.uic import compileUi
+        elif binding == 'PyQt4':
+            from PyQt4.uic import compileUi
+        elif binding == 'PySide2':
+            from pyside2uic import compileUi
+        elif binding == 'PySide':
+            from pysideuic import compileUi
+        else:
+            return None
+    except ImportError:
+        return None
+    return compileUi
+
+
+def compile_ui(ui_file, cache_dir):
+    """Compile ui_file into the cache unless it is up to date
+
+    Return the module path, or None if the binding has no compiler.
+    """
+    path = module_path(ui_file, cache_dir)
+    stamp = ui_stamp(ui_file)
+    recorded = read_stamp(path)
+    if recorded is not None and recorded[:2] == stamp:
+        return path
+
+    compile_ui_file = _compiler()
+    if compile_ui_file is None:
+        return None
+    with open(ui_file, 'rb') as xml_file:
+        match = TOP_WIDGET_RE.search(xml_file.read())
+    widget_class = match.group(1).decode('ascii') if match else 'QWidget'
+    if not os.path.isdir(cache_dir):
+        os.makedirs(cache_dir)
+    fd, tmp_path = tempfile.mkstemp(suffix='.tmp', dir=cache_dir)
+    try:
+        with os.fdopen(fd, 'w') as module_file:
+            module_file.write(STAMP_LINE.format(stamp[0], stamp[1], widget_class))
+            compile_ui_file(ui_file, module_file)
+        replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return path
+
+
+def load_ui(ui_file, cache_dir):
+    """Return the widget of ui_file built from its compiled module"""
+    try:
+        path = compile_ui(ui_file, cache_dir)
+    except Exception as ex:  # Compiler errors vary per binding
+        print('Could not compile {}: {}'.format(ui_file, ex))
+        path = None
+    if path is None:
+        return QtCompat.load_ui(ui_file)
+
+    # Bytes, Python 2 refuses a coding line in unicode source
+    with open(path, 'rb') as module_file:
+        source = module_file.read()
+    namespace = {'__name__': os.path.splitext(os.path.basename(path))[0],
+                 '__file__': path}
+    exec(compile_source(source, path), namespace)
+    form_class = [value for name, value in namespace.items()
+                  if name.startswith('Ui_') and isinstance(value, type)][0]
+
+    form = form_class()
+    widget = getattr(QtWidgets, read_stamp(path)[2], QtWidgets.QWidget)()
+    form.setupUi(widget)
+    # Named children as attributes, as load_ui does
+    for name, value in vars(form).items():
+        setattr(widget, name, value)
+    return widget
@@ -8,7 +8,6 @@ https://github.com/mottosso/Qt.py
 
 import sys
 import os
-import fnmatch
 import platform
 from crbMain import *
 
@@ -18,24 +17,15 @@ sys.dont_write_bytecode = True  # Avoid writing .pyc files
 # Environment detection
 # ----------------------------------------------------------------------
 
-try:
-    import maya.cmds as cmds
-    import pymel.core as pm
-    import maya.mel as mel
-    MAYA = True
-except ImportError:
-    MAYA = False
+# Enable access to boilerlib (Qt.py, mayapalette, dcc)
+if os.path.join(PATH, 'CRBTool') not in sys.path:
+    sys.path.append(os.path.join(PATH, 'CRBTool'))
 
-try:
-    import nuke
-    import nukescripts
-    NUKE = True
-except ImportError:
-    NUKE = False
-
-STANDALONE = False
-if not MAYA and not NUKE:
-    STANDALONE = True
+# Flags need no heavy import; pymel, maya.mel and nukescripts are
+# imported on first use, also when used by action scripts
+from boilerlib.dcc import MAYA, NUKE, STANDALONE
+from boilerlib.dcc import cmds, mel, pm, nuke, nukescripts
+from boilerlib import phasetimer
 
 
 # ----------------------------------------------------------------------
@@ -52,12 +42,29 @@ DOCK_WITH_MAYA_UI = False
 # Nuke-specific
 DOCK_WITH_NUKE_UI = False
 
+# Launching again shows the existing window instead of building a new
+# one, True always rebuilds it (for development, see crbMain.main)
+REBUILD_WINDOW = False
+
+# Custom Action lists: subdirectory levels listed below each
+# Directory slot, 0 lists the top level only
+SCAN_MAX_DEPTH = 0
+
+# Print a table of the startup phase timings, they are always logged
+# as JSON lines to CACHE_PATH/phases.jsonl
+PRINT_PHASE_SUMMARY = False
+phasetimer.configure(os.path.join(CACHE_PATH, 'phases.jsonl'), summary=PRINT_PHASE_SUMMARY)
+
 # Repository path
 REPO_PATH = os.path.join(PATH, 'CRBTool')
 
-# Palette filepath
-PALETTE_FILEPATH = os.path.join(
-    REPO_PATH, 'boilerdata', 'qpalette_maya2016.json')
+# Palette filepath, None picks the boilerdata theme matching the
+# host version (the newest one when standalone)
+PALETTE_FILEPATH = None
+
+# Apply the palette to the CRBTool window only, not the whole application.
+# Inside Maya and Nuke the palette is only applied in this mode.
+PALETTE_WINDOW_ONLY = False
 
 # Full path to where .ui files are stored
 UI_PATH = os.path.join(REPO_PATH, 'boilerdata')
@@ -72,29 +79,76 @@ if NUKE:
     os.environ['QT_PREFERRED_BINDING'] = 'PySide'
 
 
-# ----------------------------------------------------------------------
-# Set up Python modules access
-# ----------------------------------------------------------------------
-
-# Enable access to boilerlib (Qt.py, mayapalette)
-if REPO_PATH not in sys.path:
-    sys.path.append(REPO_PATH)
-
 # ----------------------------------------------------------------------
 # Main script
 # ----------------------------------------------------------------------
 import json
 
-from boilerlib.Qt import QtWidgets  # pylint: disable=E0611
-from boilerlib.Qt import QtCore  # pylint: disable=E0611
-from boilerlib.Qt import QtCompat
-from boilerlib.Qt import QtGui
-from boilerlib.Qt.QtWidgets import QFileDialog, QTabWidget
+with phasetimer.phase('qt'):
+    from boilerlib.Qt import QtWidgets  # pylint: disable=E0611
+    from boilerlib.Qt import QtCore  # pylint: disable=E0611
+    from boilerlib.Qt import QtCompat
+    from boilerlib.Qt import QtGui
+    from boilerlib.Qt.QtWidgets import QFileDialog, QTabWidget
 
 from boilerlib import mayapalette
+from boilerlib import configstore
+from boilerlib import codecache
+from boilerlib import melengine
+from boilerlib import preflight
+from boilerlib import background
+from boilerlib import dirscan
+from boilerlib import dirindex
+from boilerlib import dirwatch
+from boilerlib import scriptmodel
+from boilerlib import fuzzyindex
+from boilerlib import contentindex
+from boilerlib import batchimport
+from boilerlib import sceneheader
+from boilerlib import refpanel
+from boilerlib import filepicker
+from boilerlib import uicache
+from boilerlib import iconcache
+from boilerlib import tooltips
+from boilerlib import hostwindows
 from functools import partial
 from collections import OrderedDict
 
+# Shared in-memory view of save.json/cus_save.json
+CONFIG = configstore.ConfigStore()
+
+# Compiled action scripts, see CODE_CACHE.stats() for hits/misses.
+# Backed by a local bytecode folder so network scripts compile once.
+BYTECODE_CACHE = codecache.DiskCodeCache(os.path.join(CACHE_PATH, 'bytecode'))
+CODE_CACHE = codecache.CodeCache(maxsize=32, disk=BYTECODE_CACHE)
+
+# Cached MEL sources, evaluated in batches
+MEL_ENGINE = melengine.MelEngine()
+
+# Background existence/syntax checks of every configured script
+PREFLIGHT = preflight.Preflight(workers=4)
+
+# Listings of the Directory slots kept between sessions
+DIR_INDEX = dirindex.DirIndex(os.path.join(CACHE_PATH, 'dirindex.json'))
+
+# Icons of boilerdata/icons, decoded once per process
+ICONS = iconcache.registry(os.path.join(UI_PATH, 'icons'))
+
+# Sidecar .txt descriptions of the Action files, read on hover
+TOOLTIPS = tooltips.SidecarCache()
+
+# Names listed in the Directory slots, kept in sync by the list models
+FUZZY_INDEX = fuzzyindex.FuzzyIndex()
+
+# Tokens of the listed .py/.mel files, e.g. CONTENT_INDEX.search('polyReduce')
+CONTENT_INDEX = contentindex.ContentIndex(os.path.join(CACHE_PATH, 'contentindex.json'))
+
+# Version, plugins and references of the listed .ma/.mb files
+HEADER_INDEX = sceneheader.HeaderIndex(os.path.join(CACHE_PATH, 'sceneheaders.json'))
+
+# Custom Action modes importing the picked files in one batch
+IMPORT_MODES = ('Import Maya', 'Import Ref Maya', 'Import Ref Deferred')
+
 # Debug
 # print('Using' + QtCompat.__binding__)
 
@@ -104,13 +158,19 @@ class Boilerplate(QtWidgets.QMainWindow):
     when taking advantage of the Qt.py module and build-in methods
     from PySide/PySide2/PyQt4/PyQt5."""
 
+    # Emitted from the preflight pool with each preflight.Result
+    preflight_done = QtCore.Signal(object)
+    contents_indexed = QtCore.Signal(int)
+
+    @phasetimer.timed('window')
     def __init__(self, parent=None):
         super(Boilerplate, self).__init__(parent)
 
         # Set object name and window title
         self.setObjectName(WINDOW_OBJECT)
         self.setWindowTitle(WINDOW_TITLE)
-        self.setWindowIcon(QtGui.QIcon(os.path.join(UI_PATH, 'icons/win_icon.png')))
+        hostwindows.register(self)  # Found again by _nuke_delete_ui
+        self.setWindowIcon(ICONS.icon('win_icon'))
         # Window type
         self.setWindowFlags(QtCore.Qt.Window)
 
@@ -124,11 +184,33 @@ class Boilerplate(QtWidgets.QMainWindow):
         main_window_file = os.path.join(UI_PATH, MAIN_UI)
         # module_file = os.path.join(UI_PATH, 'module.ui')
 
-        # Load UIs
-        self.main_widget = QtCompat.load_ui(main_window_file)  # Main window UI
-        self.object_action()
-
-        self.event_show()
+        # Actions left to run and the worker of a background action
+        self.action_queue = []
+        self.worker = None
+
+        # Lists the Directory slots concurrently, see set_item_list
+        self.scanner = dirscan.DirScanner(index=DIR_INDEX, max_depth=SCAN_MAX_DEPTH, parent=self)
+        self.scanner.listing.connect(self.on_scan_listing)
+        self.scanner.found.connect(self.on_scan_found)
+        self.scanner.done.connect(self.on_scan_done)
+        self.scanner.error.connect(self.on_scan_error)
+        self.scanner.changed.connect(self.on_scan_changed)
+        self.scan_generation = 0
+        self.scan_pending = set()
+
+        # Follows the Directory roots and Action files, see update_watches
+        self.watcher = dirwatch.DirWatcher(parent=self)
+        self.watcher.dir_changed.connect(self.on_dir_changed)
+        self.watcher.file_changed.connect(self.on_file_changed)
+
+        # Load UIs, built from a module compiled once per .ui version
+        with phasetimer.phase('load_ui'):
+            self.main_widget = uicache.load_ui(main_window_file, os.path.join(CACHE_PATH, 'ui'))  # Main window UI
+        with phasetimer.phase('object_action'):
+            self.object_action()
+
+        with phasetimer.phase('event_show'):
+            self.event_show()
 
         # Set the main widget
         self.setCentralWidget(self.main_widget)
@@ -154,11 +236,16 @@ class Boilerplate(QtWidgets.QMainWindow):
         self.res_ac.triggered.connect(self.reset_ac)
         self.hel_ac.triggered.connect(self.help_ac)
         self.abo_ac.triggered.connect(self.about_ac)
+        self.pur_ac = self.main_widget.menuHelp.addAction('Purge Script Cache')
+        self.pur_ac.triggered.connect(self.purge_ac)
+        self.ref_ac = self.main_widget.menuSetup.addAction('References...')
+        self.ref_ac.triggered.connect(self.references_ac)
+        self.ref_panel = None
         self.imp_ac.triggered.connect(partial(self.im_ex, 'Import'))
         self.exp_ac.triggered.connect(partial(self.im_ex, 'Export'))
         
         self.main_widget.action_pb.clicked.connect(self.run_action)
-        self.main_widget.action_pb.setIcon(QtGui.QIcon(os.path.join(UI_PATH, 'icons/action.png')))
+        self.main_widget.action_pb.setIcon(ICONS.icon('action'))
 
         # TODO: Tab Mini Script action
         self.main_widget.run_pb.clicked.connect(self.custom_run_action)
@@ -195,20 +282,65 @@ class Boilerplate(QtWidgets.QMainWindow):
             self.main_widget.cus_action_3_cb
         )
 
+        # Paged models, the combos never hold one item per file
+        self.cus_model = tuple(scriptmodel.ScriptListModel(x, FUZZY_INDEX, self.cus_ac.index(x))
+                               for x in self.cus_ac)
+        for x in range(len(self.cus_ac)):
+            self.cus_ac[x].setModel(self.cus_model[x])
+
+        # Pick several files of a slot to import or reference at once
+        self.pick_pb = []
+        for x in range(len(self.cus_ac)):
+            pick_pb = QtWidgets.QToolButton(self.main_widget.mini_tab)
+            pick_pb.setText('...')
+            pick_pb.setToolTip('Pick several files to import or reference')
+            pick_pb.clicked.connect(partial(self.pick_files, x))
+            pick_layout = QtWidgets.QHBoxLayout()
+            pick_layout.addWidget(self.cus_ac[x], 1)
+            pick_layout.addWidget(pick_pb)
+            self.main_widget.gridLayout_3.removeWidget(self.cus_ac[x])
+            self.main_widget.gridLayout_3.addLayout(pick_layout, x, 1)
+            self.pick_pb.append(pick_pb)
+
+        # Fuzzy search over every Directory slot
+        self.search_le = QtWidgets.QLineEdit(self.main_widget.mini_tab)
+        self.search_le.setPlaceholderText('Search scripts and scenes...')
+        self.search_lw = QtWidgets.QListWidget(self.main_widget.mini_tab)
+        self.search_lw.setMaximumHeight(120)
+        self.search_lw.hide()
+        self.search_in_cb = QtWidgets.QCheckBox('In files', self.main_widget.mini_tab)
+        self.search_in_cb.setToolTip('Search the contents of the listed .py/.mel files')
+        search_layout = QtWidgets.QHBoxLayout()
+        search_layout.addWidget(self.search_le)
+        search_layout.addWidget(self.search_in_cb)
+        self.main_widget.verticalLayout_3.insertLayout(0, search_layout)
+        self.main_widget.verticalLayout_3.insertWidget(1, self.search_lw)
+        self.search_results = []
+        self.search_le.textChanged.connect(self.search_items)
+        self.search_in_cb.toggled.connect(lambda: self.search_items(self.search_le.text()))
+        self.contents_indexed.connect(self.on_contents_indexed)
+        self.search_le.returnPressed.connect(partial(self.select_result, 0))
+        self.search_lw.itemActivated.connect(
+            lambda item: self.select_result(self.search_lw.row(item)))
+
         self.ch_ac = (
             self.main_widget.check_action_1_cb,
             self.main_widget.check_action_2_cb,
             self.main_widget.check_action_3_cb
         )
 
-        self.set_tooltip()
+        # Tooltips of the Action slots are read on hover
+        self.tip_filter = tooltips.TooltipFilter(self.action_tooltip, self)
+        for x in self.act_cb:
+            x.installEventFilter(self.tip_filter)
 
-        for x in self.la_pb:
-            self.check_icons(self.la_pb.index(x))
-            x.clicked.connect(partial(self.load_pb, int(self.la_pb.index(x))))
+        with phasetimer.phase('check_icons'):
+            for x in self.la_pb:
+                self.check_icons(self.la_pb.index(x))
+                x.clicked.connect(partial(self.load_pb, int(self.la_pb.index(x))))
 
         for x in self.btn_run:
-            x.setIcon(QtGui.QIcon(os.path.join(REPO_PATH, 'boilerdata/icons/btn_run.png')))
+            x.setIcon(ICONS.icon('btn_run'))
             x.clicked.connect(partial(self.run_btn, int(self.btn_run.index(x))))
 
         self.change_item(0)
@@ -216,16 +348,24 @@ class Boilerplate(QtWidgets.QMainWindow):
         
         for x in range(len(self.ch_ac)):
             self.cus_ac[x].setEnabled(False)
+            self.pick_pb[x].setEnabled(False)
             self.ch_ac[x].stateChanged.connect(self.check_item)
 
         if os.path.isfile(CUS_FILE_PATH):
-            self.set_item_list()
+            with phasetimer.phase('set_item_list'):
+                self.set_item_list()
         
         self.main_widget.tabWidget.currentChanged.connect(self.im_ex)
+
+        self.preflight_done.connect(self.on_preflight)
+        self.run_preflight()
+        self.update_watches()
+        self.state = self.config_state()
 # ----------------------------------------------------------------------
 # Tab Mini Action
 # ----------------------------------------------------------------------    
     def custom_run_action(self):
+        batch = []
         for x in range(len(self.ch_ac)):
             if self.ch_ac[x].isChecked() and self.main_widget.sett_cb.currentText() == 'Run Script':
                 print('Run Script from {}:'.format(x))
@@ -234,11 +374,15 @@ class Boilerplate(QtWidgets.QMainWindow):
 
             elif self.ch_ac[x].isChecked() and self.main_widget.sett_cb.currentText() == 'Import Maya':
                 print('Import Maya from {}'.format(x))
-                self.run_item_list(x)
+                batch.extend(self.selected_files(x))
 
             elif self.ch_ac[x].isChecked() and self.main_widget.sett_cb.currentText() == 'Import Ref Maya':
                 print('Import Ref Maya from {}'.format(x))
-                self.run_item_list(x)
+                batch.extend(self.selected_files(x))
+
+            elif self.ch_ac[x].isChecked() and self.main_widget.sett_cb.currentText() == 'Import Ref Deferred':
+                print('Import Ref Deferred from {}'.format(x))
+                batch.extend(self.selected_files(x))
                 
             elif self.ch_ac[x].isChecked() and self.main_widget.sett_cb.currentText() == 'Add Dir':
                 print('Add item in {}'.format(x))
@@ -259,92 +403,375 @@ class Boilerplate(QtWidgets.QMainWindow):
                 self.set_item_list()
             else:
                 pass
+
+        if batch:
+            self.run_batch_import(batch, self.main_widget.sett_cb.currentText())
+
+    def pick_files(self, x):
+        picker = filepicker.FilePicker(self.cus_model[x], 'Directory {}'.format(x+1), parent=self)
+        picker.exec_()
+        picker.deleteLater()
+
+    def selected_files(self, x):
+        """Return full paths of the picked files of a slot, else its current file"""
+        root = CONFIG.value(CUS_FILE_PATH, x)
+        if not root:
+            return []
+        names = self.cus_model[x].checked()
+        current = self.cus_ac[x].currentText()
+        if not names and current:
+            names = [current]
+        return [os.path.join(root, name) for name in names]
+
+    def run_batch_import(self, paths, mode='Import Maya'):
+        """Import or reference Maya scenes in one pass and one undo chunk
+
+        'Import Ref Deferred' creates the references unloaded, they are
+        loaded on demand from Setup > References...
+        """
+        reference = mode in ('Import Ref Maya', 'Import Ref Deferred')
+        deferred = mode == 'Import Ref Deferred'
+        paths = self.check_headers(paths)
+        importer = batchimport.BatchImporter(cmds)
+        plan = importer.plan(paths)
+        for path, namespace in plan:
+            print('{} {} as {}:'.format('REFERENCE' if reference else 'IMPORT', path, namespace))
+        results = importer.run(paths, reference, plan, deferred)
+        print(batchimport.report(results))
+        for model in self.cus_model:
+            model.clear_checks()
+        if self.ref_panel is not None and self.ref_panel.isVisible():
+            self.ref_panel.refresh()
+
+    def references_ac(self):
+        if self.ref_panel is None:
+            self.ref_panel = refpanel.ReferencePanel(cmds, parent=self)
+        self.ref_panel.refresh()
+        self.ref_panel.show()
+        self.ref_panel.raise_()
+
+    def check_headers(self, paths):
+        """Return paths without the scenes the user skips for failing headers"""
+        scenes = [path for path in paths
+                  if os.path.splitext(path)[1].lower() in batchimport.FILE_TYPES]
+        if not scenes:
+            return paths
+        available = sceneheader.available_plugins(cmds.pluginInfo(query=True, listPlugins=True) or [])
+        maya_version = cmds.about(version=True)
+        flagged = []
+        for path, header in zip(scenes, HEADER_INDEX.read_all(scenes)):
+            found = sceneheader.problems(header, available, maya_version)
+            if found:
+                flagged.append((path, found))
+        if not flagged:
+            return paths
+
+        message = '\n'.join('{}: {}'.format(os.path.basename(path), ', '.join(found))
+                            for path, found in flagged)
+        answer = QtGui.QMessageBox.question(
+            self, 'Scene Check', message + '\n\nImport these files anyway?',
+            QtGui.QMessageBox.Yes | QtGui.QMessageBox.No, QtGui.QMessageBox.No)
+        if answer == QtGui.QMessageBox.Yes:
+            return paths
+        skipped = set(path for path, found in flagged)
+        return [path for path in paths if path not in skipped]
+
     def run_item_list(self, x):
-        with open(CUS_FILE_PATH, 'r') as load_file:
-            load_json = json.load(load_file, object_pairs_hook=OrderedDict)
-            load_key = load_json.keys()
-            load_value = load_json.values()
-        nam_file, typ_file = os.path.splitext(self.cus_ac[x].currentText())
+        load_value = CONFIG.values(CUS_FILE_PATH)
+        nam_file, typ_file = os.path.splitext(os.path.basename(self.cus_ac[x].currentText()))
         exec_file = os.path.join(load_value[x], self.cus_ac[x].currentText())
 
         print(exec_file)
         if load_value[x] != '':
             if self.main_widget.sett_cb.currentText() == 'Run Script':
                 if typ_file == '.py':
-                    print('RUN {}:'.format(load_value))
-                    exec(open(exec_file).read())
+                    print('RUN {}:'.format(exec_file))
+                    self.exec_script(exec_file)
                 elif typ_file == '.mel':
-                    print('RUN {}:'.format(load_value))
-                    mel.eval(open(load_value).read())
+                    print('RUN {}:'.format(exec_file))
+                    MEL_ENGINE.run(exec_file)
             elif self.main_widget.sett_cb.currentText() == 'Run Script':
                 if typ_file == '.ma' or typ_file == '.mb':
                     print('\n{} tidak bisa dijalankan, harus di import!!\n'.format(exec_file))
                 
-            elif self.main_widget.sett_cb.currentText() == 'Import Ref Maya':
-                if typ_file == '.ma':
-                    pm.cmds.file("{}".format(exec_file), ignoreVersion=1, type="mayaAscii", namespace="{}".format(nam_file), r=1, gl=1, mergeNamespacesOnClash=False, options="v=0;p=17;f=0")
-                elif typ_file == '.mb':
-                    pm.cmds.file("{}".format(exec_file), ignoreVersion=1, type="mayaBinary", namespace="{}".format(nam_file), r=1, gl=1, mergeNamespacesOnClash=False, options="v=0;p=17;f=0")
-            
-            elif self.main_widget.sett_cb.currentText() == 'Import Maya':
-                if typ_file == '.ma':
-                    pm.cmds.file("{}".format(exec_file), pr=1, ignoreVersion=1, i=1, type="mayaAscii", namespace="{}".format(nam_file), ra=True, mergeNamespacesOnClash=False, options="v=0;p=17;f=0")
-                elif typ_file == '.mb':
-                    pm.cmds.file("{}".format(exec_file), pr=1, ignoreVersion=1, i=1, type="mayaBinary", namespace="{}".format(nam_file), ra=True, mergeNamespacesOnClash=False, options="v=0;p=17;f=0")
+            elif self.main_widget.sett_cb.currentText() in IMPORT_MODES:
+                self.run_batch_import([exec_file], self.main_widget.sett_cb.currentText())
 
     # Set text pushbutton
     def change_item(self, pos):
         item_text = self.main_widget.run_pb.setText(self.main_widget.sett_cb.itemText(pos))
         if pos:
             item_text
+        # Picked files only matter when importing
+        importing = self.main_widget.sett_cb.itemText(pos) in IMPORT_MODES
+        for x in range(len(self.cus_model)):
+            self.cus_model[x].set_checkable(importing)
+            self.pick_pb[x].setVisible(importing)
 
     def check_item(self):
         for x in range(len(self.ch_ac)):
             if self.ch_ac[x].isChecked():
                 self.cus_ac[x].setEnabled(True)
+                self.pick_pb[x].setEnabled(True)
             else:
                 self.cus_ac[x].setEnabled(False)
+                self.pick_pb[x].setEnabled(False)
+
+    def search_items(self, text):
+        self.search_lw.clear()
+        if self.search_in_cb.isChecked():
+            self.search_results = self.content_results(text)
+        else:
+            self.search_results = [(slot, name) for score, slot, name in FUZZY_INDEX.search(text)]
+        for slot, name in self.search_results:
+            self.search_lw.addItem('{}    (Directory {})'.format(name, slot+1))
+        self.search_lw.setVisible(bool(self.search_results))
+
+    def content_results(self, text):
+        """Return (slot, name) of the listed files containing text"""
+        if not text.strip() or not CONFIG.exists(CUS_FILE_PATH):
+            return []
+        roots = [os.path.join(os.path.normpath(x), '') if x else None
+                 for x in CONFIG.values(CUS_FILE_PATH)]
+        results = []
+        for path in CONTENT_INDEX.search(text):
+            for x, root in enumerate(roots[:len(self.cus_ac)]):
+                if root and path.startswith(root):
+                    results.append((x, path[len(root):].replace(os.sep, '/')))
+                    break
+        return results
+
+    def index_contents(self):
+        """Update the content index of the listed files in the background"""
+        CONTENT_INDEX.sync_async(self.listed_files(), callback=self.contents_indexed.emit)
+
+    def on_contents_indexed(self, changed):
+        if changed:
+            print('== CONTENT INDEX: {} files updated =='.format(changed))
+        if self.search_in_cb.isChecked() and self.search_le.text():
+            self.search_items(self.search_le.text())
+
+    def select_result(self, row):
+        """Check the slot of a search result and select it in its list"""
+        if row >= len(self.search_results):
+            return
+        slot, name = self.search_results[row]
+        index = self.cus_model[slot].row_of(name)
+        if index < 0:
+            return
+        self.ch_ac[slot].setChecked(True)
+        self.cus_ac[slot].setCurrentIndex(index)
+        self.search_le.clear()
 
     def set_item_list(self):
+        load_key = CONFIG.keys(CUS_FILE_PATH)
+        load_value = CONFIG.values(CUS_FILE_PATH)
 
+        roots = []
         for x in range(len(self.cus_ac)):
-            self.cus_ac[x].clear()
-            with open(CUS_FILE_PATH, 'r') as load_file:
-                load_json = json.load(load_file, object_pairs_hook=OrderedDict)
-                load_key = load_json.keys()
-                load_value = load_json.values()
+            self.cus_model[x].clear()
 
             key_nam = 'Directory '+ str(x+1)
             if key_nam in load_key[x] and load_value[x] != '':
-                for ldir in os.listdir(load_value[x]):
-                    patterns = ['*.ma','*.py','*.mel','*.mb']
-                    for patt in patterns:
-                        if fnmatch.fnmatch(ldir, patt):
-                            self.cus_ac[x].addItem(ldir)
-                            
+                # Fill from the index right away, the scanner only
+                # lists the directory again when its mtime changed
+                entries = DIR_INDEX.entries(load_value[x], SCAN_MAX_DEPTH)
+                if entries is not None:
+                    self.cus_model[x].add_entries(entries)
+                    self.mark_failures(x, entries)
+                roots.append((x, load_value[x]))
+
+        # Items are added as the scanner streams them in on_scan_found
+        self.scan_generation = self.scanner.scan(roots)
+        self.scan_pending = set(x for x, root in roots)
+        self.update_watches()
         print('\n== SET ITEMS LIST ==')
-        
+
+    def on_scan_listing(self, generation, slot):
+        if generation == self.scan_generation:
+            self.cus_model[slot].clear()
+
+    def on_scan_found(self, generation, slot, entries):
+        if generation == self.scan_generation:
+            self.cus_model[slot].add_entries(entries)
+            self.mark_failures(slot, entries)
+
+    def on_scan_done(self, generation, slot):
+        if generation == self.scan_generation:
+            self.run_preflight(self.listed_files(slot))
+            # Index contents once every slot is listed
+            self.scan_pending.discard(slot)
+            if not self.scan_pending:
+                self.index_contents()
+                HEADER_INDEX.scan(self.listed_files())
+
+    def on_scan_error(self, generation, slot, message):
+        print('Could not list Directory {}: {}'.format(slot+1, message))
+
+    def on_scan_changed(self, slot, added, removed, modified):
+        """Apply the difference of one rescanned root to its list"""
+        model = self.cus_model[slot]
+        model.remove_names([entry.name for entry in removed])
+        new = [entry for entry in sorted(added) if entry.name not in model]
+        model.add_entries(new)
+        self.mark_failures(slot, new)
+
+        root = CONFIG.value(CUS_FILE_PATH, slot)
+        PREFLIGHT.check([os.path.join(root, entry.name) for entry in added + modified],
+                        callback=self.preflight_done.emit)
+        self.index_contents()
+        print('Directory {}: +{} -{} ~{}'.format(
+            slot+1, len(added), len(removed), len(modified)))
+
+    def update_watches(self):
+        """Watch the configured Directory roots and Action files"""
+        dirs = []
+        if CONFIG.exists(CUS_FILE_PATH):
+            for root in CONFIG.values(CUS_FILE_PATH):
+                if root:
+                    dirs.append(root)
+                    # Subdirectories listed in recursive mode
+                    dirs.extend(os.path.join(root, rel)
+                                for rel in DIR_INDEX.dirs(root, SCAN_MAX_DEPTH) if rel)
+        files = []
+        if CONFIG.exists(FILE_PATH):
+            files = CONFIG.values(FILE_PATH)
+        self.watcher.set_dirs(dirs)
+        self.watcher.set_files(files)
+
+    def on_dir_changed(self, path):
+        if not CONFIG.exists(CUS_FILE_PATH):
+            return
+        for x, root in enumerate(CONFIG.values(CUS_FILE_PATH)):
+            if not root:
+                continue
+            root_path = os.path.normpath(root)
+            if path == root_path or path.startswith(os.path.join(root_path, '')):
+                self.scanner.refresh(x, root)
+
+    def on_file_changed(self, path):
+        PREFLIGHT.check([path], callback=self.preflight_done.emit)
+
+    def config_state(self):
+        """Return what the window was built from: activation and save files"""
+        return (os.path.exists(DIR_PATH),
+                CONFIG.values(FILE_PATH) if CONFIG.exists(FILE_PATH) else None,
+                CONFIG.values(CUS_FILE_PATH) if CONFIG.exists(CUS_FILE_PATH) else None)
+
+    def refresh_state(self):
+        """Bring a reused window up to date with the save files and folders
+
+        Nothing is rebuilt when the save files are unchanged; Directory
+        roots changed since their last listing are listed again.
+        """
+        state = self.config_state()
+        if state != self.state:
+            self.state = state
+            self.event_show()
+            for x in range(len(self.la_pb)):
+                self.check_icons(x)
+            if state[2] is not None:
+                self.set_item_list()
+            self.run_preflight()
+            return
+        if state[2] is not None:
+            for x, root in enumerate(state[2]):
+                if root and not DIR_INDEX.is_fresh(root, SCAN_MAX_DEPTH):
+                    self.scanner.refresh(x, root)
+
+    def reuse(self):
+        """Refresh and bring the window to the front"""
+        self.refresh_state()
+        if self.isMinimized():
+            self.showNormal()
+        else:
+            self.show()
+        self.raise_()
+        self.activateWindow()
+
 # ----------------------------------------------------------------------
 # Tab Run Script
 # ----------------------------------------------------------------------
     def run_action(self):
+        if self.worker is not None:
+            # A background action is running, the button cancels it
+            print('== CANCEL ==')
+            self.action_queue = []
+            self.worker.cancel()
+            return
+
+        load_values = CONFIG.values(FILE_PATH)
+
+        # Refuse to start rather than stop halfway on a bad file
+        failed = []
         for x in range(len(self.la_pb)):
-            with open(FILE_PATH, 'r') as load_file:
-                load_json = json.load(load_file, object_pairs_hook=OrderedDict)
-                load_key = load_json.keys()[x]
-                load_value = load_json.values()[x]
-                if load_value != '' and self.act_cb[x].isChecked():
-                    nam_file, typ_file = os.path.splitext(load_value)
-                    if typ_file == '.py':
-                        print('RUN {}:'.format(load_value))
-                        exec(open(load_value).read())
-                    elif typ_file == '.mel':
-                        print('RUN {}:'.format(load_value))
-                        mel.eval(open(load_value).read())
-                load_file.close()
+            if load_values[x] != '' and self.act_cb[x].isChecked():
+                result = PREFLIGHT.check_now(load_values[x])
+                if not result.ok:
+                    failed.append('{}: {}'.format(result.path, result.message))
+        if failed:
+            QtGui.QMessageBox.critical(self, 'Error', '\n'.join(failed))
+            return
+
+        self.action_queue = [load_values[x] for x in range(len(self.la_pb))
+                             if load_values[x] != '' and self.act_cb[x].isChecked()]
+        self.run_queue()
+
+    def run_queue(self):
+        """Run queued actions in order until one goes to the background"""
+        # Consecutive MEL slots are sent to Maya as one batch
+        mel_batch = []
+        while self.action_queue:
+            load_value = self.action_queue.pop(0)
+            nam_file, typ_file = os.path.splitext(load_value)
+            if typ_file == '.py':
+                self.run_mel_batch(mel_batch)
+                mel_batch = []
+                print('RUN {}:'.format(load_value))
+                if background.is_background(load_value):
+                    # The queue resumes in on_worker_finished
+                    self.start_worker(load_value)
+                    return
+                self.exec_script(load_value)
+            elif typ_file == '.mel':
+                print('RUN {}:'.format(load_value))
+                mel_batch.append(load_value)
+        self.run_mel_batch(mel_batch)
 
         print('== CLEANING ==')
 
+    def start_worker(self, path):
+        """Run a background-safe action on a worker thread"""
+        namespace = dict(globals())
+        namespace['__file__'] = path
+        self.worker = background.ScriptWorker(CODE_CACHE.get(path), namespace, parent=self)
+        self.worker.progress.connect(self.on_worker_progress)
+        self.worker.failed.connect(self.on_worker_failed)
+        self.worker.finished.connect(self.on_worker_finished)
+        self.main_widget.action_pb.setText('0%')
+        self.main_widget.action_pb.setToolTip('Running {}, click to cancel'.format(path))
+        self.worker.start()
+
+    def on_worker_progress(self, value, maximum):
+        if maximum > 0:
+            self.main_widget.action_pb.setText('{}%'.format(100 * value // maximum))
+
+    def on_worker_failed(self, message):
+        print(message)
+        self.action_queue = []
+
+    def on_worker_finished(self):
+        cancelled = self.worker.is_cancelled()
+        self.worker.deleteLater()
+        self.worker = None
+        self.main_widget.action_pb.setText('')
+        self.main_widget.action_pb.setToolTip('')
+        if cancelled:
+            self.action_queue = []
+            print('== CANCELLED ==')
+        else:
+            self.run_queue()
+
     def load_pb(self, pos):
         if self.act_cb[pos].isChecked():
             if 'Action {}'.format(pos+1) == self.act_cb[pos].text():
@@ -356,43 +783,41 @@ class Boilerplate(QtWidgets.QMainWindow):
         else:
             print('REMOVE: {}'.format(self.act_cb[pos].text()))
 
-            load_file = open(os.path.join(REPO_PATH, 'boilerdata/save.json'), 'r')
-            load_json = json.load(load_file)
+            default_value = CONFIG.value(os.path.join(REPO_PATH, 'boilerdata/save.json'), pos)
 
             var = 'Action ' + str(pos+1)
-            self.set_file(var, load_json.values()[pos])  
-            print(load_json.values()[pos])          
+            self.set_file(var, default_value)
+            print(default_value)
             self.check_icons(pos)
 
-            self.set_tooltip()
     def run_btn(self, pos):
-        with open(FILE_PATH, 'r') as load_file:
-            load_json = json.load(load_file, object_pairs_hook=OrderedDict)
-            load_key = load_json.keys()[pos]
-            load_value = load_json.values()[pos]
-            if load_value != '':
-                nam_file, typ_file = os.path.splitext(load_value)
-                try :
-                    if typ_file == '.py':
-                        print('RUN {}:'.format(load_value))
-                        exec(open(load_value).read())
-                    elif typ_file == '.mel':
-                        print('RUN {}:'.format(load_value))
-                        mel.eval(open(load_value).read())
-                except IOError:
-                    QtGui.QMessageBox.critical(self, 'Error', 'File tidak ditemukan (file dipindah/file dihapus)')
+        load_value = CONFIG.value(FILE_PATH, pos)
+        if load_value != '':
+            nam_file, typ_file = os.path.splitext(load_value)
+            try :
+                if typ_file == '.py':
+                    print('RUN {}:'.format(load_value))
+                    if not background.is_background(load_value):
+                        self.exec_script(load_value)
+                    elif self.worker is None:
+                        self.start_worker(load_value)
+                elif typ_file == '.mel':
+                    print('RUN {}:'.format(load_value))
+                    MEL_ENGINE.run(load_value)
+            except IOError:
+                QtGui.QMessageBox.critical(self, 'Error', 'File tidak ditemukan (file dipindah/file dihapus)')
     def reset_ac(self):
         try:
-            self.set_file('boilerdata/save.json', FILE_PATH)
-            self.set_file('boilerdata/cus_save.json', CUS_FILE_PATH)
-            self.set_item_list()
-            for x in self.act_cb:
-                x.setChecked(False)
+            with CONFIG.journal():
+                self.set_file('boilerdata/save.json', FILE_PATH)
+                self.set_file('boilerdata/cus_save.json', CUS_FILE_PATH)
+                self.set_item_list()
+                for x in self.act_cb:
+                    x.setChecked(False)
+
+                for x in self.la_pb:
+                    self.check_icons(self.la_pb.index(x))
 
-            for x in self.la_pb:
-                self.check_icons(self.la_pb.index(x))
-            
-            self.set_tooltip()
 
             print('== RESET ACTION ==')
         except:
@@ -400,6 +825,24 @@ class Boilerplate(QtWidgets.QMainWindow):
 
     def help_ac(self):
         print('== HELP ACTION ==')
+        print('Code cache: {hits} hits, {misses} misses, '
+              '{size}/{maxsize} scripts'.format(**CODE_CACHE.stats()))
+
+    def run_mel_batch(self, paths):
+        """Evaluate MEL action scripts with a single mel.eval"""
+        if paths:
+            MEL_ENGINE.run_batch(paths)
+
+    def purge_ac(self):
+        count = purge_bytecode_cache()
+        print('== PURGE SCRIPT CACHE: {} files =='.format(count))
+
+    def exec_script(self, path):
+        """Execute a Python action script from the compiled code cache"""
+        code = CODE_CACHE.get(path)
+        namespace = dict(globals())
+        namespace.update({'__file__': path, 'self': self})
+        exec(code, namespace)
 
     def open_dialog(self, pos):
         file_name = QFileDialog.getOpenFileName(self, 'Get Path File', 'C:/', 'Script Files (*.mel *.py)')
@@ -410,55 +853,100 @@ class Boilerplate(QtWidgets.QMainWindow):
             var = 'Action ' + str(pos+1)
             # print(var)
             self.set_file(var, file_name[0])
-            self.set_tooltip()
 
     def set_file(self, pos, path):
+        # Changes are written back by CONFIG in one debounced, atomic write
         PATH_ = path
         SAVE_PATH_ = pos
         # print(SAVE_PATH_, PATH_)
+        # Only the changed action paths are checked; a changed Directory
+        # is listed again and checked once its scan is done
         if 'Action ' in pos:
-            with open(FILE_PATH, 'r+') as load_file:
-                load_json = json.load(load_file)
-                load_json[pos] = str(path)
-                load_file.seek(0)
-                json.dump(load_json, load_file, sort_keys=True, indent=4)
-                load_file.truncate()
-                load_file.close()
+            CONFIG.set(FILE_PATH, pos, str(path))
+            self.run_preflight([path])
         elif 'Directory ' in pos:
-            with open(CUS_FILE_PATH, 'r+') as load_file:
-                load_json = json.load(load_file)
-                load_json[pos] = str(path)
-                load_file.seek(0)
-                json.dump(load_json, load_file, sort_keys=True, indent=4)
-                load_file.truncate()
-                load_file.close()
+            CONFIG.set(CUS_FILE_PATH, pos, str(path))
         else:
-            create_file = open(PATH_, 'w')
-            create_file.truncate()
-            load_new_file = open(os.path.join(REPO_PATH, SAVE_PATH_), 'r')
-            load_json = json.load(load_new_file)
-            json.dump(load_json, create_file, sort_keys=True, indent=4)
-            create_file.close()
-
-    def set_tooltip(self):
-        # pass
-        if os.path.isfile(FILE_PATH):
-            for x in range(len(self.act_cb)):
-                with open(FILE_PATH, 'r') as load_file:
-                    load_json = json.load(load_file, object_pairs_hook=OrderedDict)
-                    load_value = load_json.values()[x]
-                    if load_value != '':
-                        nam_file, typ_file = os.path.splitext(load_value)
-                        # nam = nam_file.split('/')[-1]
-                        nam = nam_file + '.txt'
-                        if os.path.isfile(nam):
-                            tooltip_file = open(nam, 'r')
-                            self.act_cb[x].setToolTip('{}'.format(tooltip_file.read()))
-                        else:
-                            self.act_cb[x].setToolTip('Directory: {}'.format(load_value))
-                    else:
-                        self.act_cb[x].setToolTip(None)
-                    load_file.close()
+            load_json = CONFIG.load(os.path.join(REPO_PATH, SAVE_PATH_))
+            CONFIG.replace(PATH_, load_json)
+            if PATH_ == FILE_PATH:
+                self.run_preflight(CONFIG.values(FILE_PATH))
+        self.update_watches()
+
+    def run_preflight(self, paths=None):
+        """Check given filepaths in the background
+
+        By default every action slot and listed script is checked.
+        """
+        if paths is None:
+            paths = []
+            if CONFIG.exists(FILE_PATH):
+                paths.extend(CONFIG.values(FILE_PATH))
+            paths.extend(self.listed_files())
+        if paths:
+            PREFLIGHT.check(paths, callback=self.preflight_done.emit)
+
+    def listed_files(self, slot=None):
+        """Return full paths of the files listed in the Custom Action tab
+
+        Only the files of given Directory slot if one is given.
+        """
+        if not CONFIG.exists(CUS_FILE_PATH):
+            return []
+        load_value = CONFIG.values(CUS_FILE_PATH)
+        slots = range(len(self.cus_ac)) if slot is None else [slot]
+        files = []
+        for x in slots:
+            if load_value[x] == '':
+                continue
+            for name in self.cus_model[x].names():
+                files.append(os.path.join(load_value[x], name))
+        return files
+
+    def on_preflight(self, result):
+        """Show a preflight result as slot/item icon"""
+        if CONFIG.exists(FILE_PATH):
+            for pos, load_value in enumerate(CONFIG.values(FILE_PATH)):
+                if load_value and os.path.normpath(load_value) == result.path:
+                    self.check_icons(pos)
+
+        if CONFIG.exists(CUS_FILE_PATH):
+            load_value = CONFIG.values(CUS_FILE_PATH)
+            for x in range(len(self.cus_ac)):
+                root = os.path.join(os.path.normpath(load_value[x]), '')
+                if load_value[x] == '' or not result.path.startswith(root):
+                    continue
+                name = result.path[len(root):].replace(os.sep, '/')
+                if name not in self.cus_model[x]:
+                    continue
+                if result.ok:
+                    self.cus_model[x].set_icon(name, None)
+                else:
+                    self.cus_model[x].set_icon(name, ICONS.icon('human-skull'))
+
+    def mark_failures(self, slot, entries):
+        """Show the known preflight failures of entries added to a list
+
+        PREFLIGHT only reports results that changed, so entries listed
+        again take their icon from the cached results.
+        """
+        root = CONFIG.value(CUS_FILE_PATH, slot)
+        for entry in entries:
+            result = PREFLIGHT.result(os.path.join(root, entry.name))
+            if result is not None and not result.ok:
+                self.cus_model[slot].set_icon(entry.name, ICONS.icon('human-skull'))
+
+    def action_tooltip(self, widget):
+        """Return the tooltip of an Action slot: its sidecar .txt or path"""
+        if not CONFIG.exists(FILE_PATH):
+            return None
+        load_value = CONFIG.value(FILE_PATH, self.act_cb.index(widget))
+        if load_value == '':
+            return None
+        text = TOOLTIPS.text(load_value)
+        if text is not None:
+            return text
+        return 'Directory: {}'.format(load_value)
 # ----------------------------------------------------------------------
 # Setting event show
 # ----------------------------------------------------------------------
@@ -466,17 +954,22 @@ class Boilerplate(QtWidgets.QMainWindow):
         if not os.path.exists(DIR_PATH):
             os.makedirs(DIR_PATH)
 
-            if not os.path.isfile(FILE_PATH):
-                self.set_file('boilerdata/save.json', FILE_PATH)
+            with CONFIG.journal():
+                if not os.path.isfile(FILE_PATH):
+                    self.set_file('boilerdata/save.json', FILE_PATH)
 
-            if not os.path.isfile(CUS_FILE_PATH):
-                self.set_file('boilerdata/cus_save.json', CUS_FILE_PATH)
-                self.set_item_list()
+                if not os.path.isfile(CUS_FILE_PATH):
+                    self.set_file('boilerdata/cus_save.json', CUS_FILE_PATH)
+                    self.set_item_list()
 
             self.event_show()
             print('== FOLDER & FILE CREATED ==')
         else:
-            self.reset_ac()
+            with CONFIG.journal():
+                self.reset_ac()
+                # Nothing left to write back, the files are deleted below
+                CONFIG.discard(FILE_PATH)
+                CONFIG.discard(CUS_FILE_PATH)
             if os.path.isfile(FILE_PATH):
                 os.remove(FILE_PATH)
 
@@ -498,21 +991,18 @@ class Boilerplate(QtWidgets.QMainWindow):
             if val is 'Import':
                 import_file = QFileDialog.getOpenFileName(self, val, 'C:/', '*.json')
                 if import_file[0]:
-                    open_file = open(import_file[0], 'r')
-                    replace_file = open(FILE_PATH, 'w')
-                    json_open_file = json.load(open_file, object_pairs_hook=OrderedDict)
-                    replace_file.truncate()
-                    json.dump(json_open_file, replace_file, sort_keys=True, indent=4)
-                    replace_file.close()
-                    for x in range(len(self.la_pb)):
-                        self.check_icons(x)
+                    with open(import_file[0], 'r') as open_file:
+                        json_open_file = json.load(open_file, object_pairs_hook=OrderedDict)
+                    with CONFIG.journal():
+                        CONFIG.replace(FILE_PATH, json_open_file)
+                        for x in range(len(self.la_pb)):
+                            self.check_icons(x)
                     print('Import from {}. Successfully'.format(import_file[0]))
             elif val is 'Export':
                 export_file = QFileDialog.getSaveFileName(self, val, 'C:/', '*.json')
                 if export_file[0]:
-                    open_file = open(FILE_PATH, 'r')
                     write_file = open(export_file[0], 'w')
-                    json_open_file = json.load(open_file, object_pairs_hook=OrderedDict)
+                    json_open_file = CONFIG.load(FILE_PATH)
                     write_file.truncate()
                     json.dump(json_open_file, write_file, sort_keys=True, indent=4)
                     write_file.close()
@@ -522,18 +1012,25 @@ class Boilerplate(QtWidgets.QMainWindow):
             self.exp_ac.setEnabled(False)
     def check_icons(self, pos):
         try:
-            with open(FILE_PATH, 'r') as load_file:
-                load_json = json.load(load_file, object_pairs_hook=OrderedDict)
-                if len(load_json.values()[pos]) != 0:
-                    self.la_pb[pos].setIcon(QtGui.QIcon(os.path.join(REPO_PATH, 'boilerdata/icons/minus.png')))
-                    self.act_cb[pos].setText(self.set_nam(load_json.values()[pos]))
-                    self.btn_run[pos].setEnabled(True)
-                else:
-                    self.la_pb[pos].setIcon(QtGui.QIcon(os.path.join(REPO_PATH, 'boilerdata/icons/add.png')))
-                    self.act_cb[pos].setText(self.set_nam(load_json.keys()[pos]))
-                    self.btn_run[pos].setEnabled(False)
+            load_value = CONFIG.value(FILE_PATH, pos)
+            result = PREFLIGHT.result(load_value) if load_value else None
+            if result is not None and not result.ok:
+                self.la_pb[pos].setIcon(ICONS.icon('human-skull'))
+                self.la_pb[pos].setToolTip('{}: {}'.format(result.status, result.message))
+                self.act_cb[pos].setText(self.set_nam(load_value))
+                self.btn_run[pos].setEnabled(False)
+            elif len(load_value) != 0:
+                self.la_pb[pos].setIcon(ICONS.icon('minus'))
+                self.la_pb[pos].setToolTip('')
+                self.act_cb[pos].setText(self.set_nam(load_value))
+                self.btn_run[pos].setEnabled(True)
+            else:
+                self.la_pb[pos].setIcon(ICONS.icon('add'))
+                self.la_pb[pos].setToolTip('')
+                self.act_cb[pos].setText(self.set_nam(CONFIG.key(FILE_PATH, pos)))
+                self.btn_run[pos].setEnabled(False)
         except Exception as ex:
-            self.la_pb[pos].setIcon(QtGui.QIcon(os.path.join(REPO_PATH, 'boilerdata/icons/add.png')))
+            self.la_pb[pos].setIcon(ICONS.icon('add'))
             print(ex)
             pass         
 
@@ -564,6 +1061,33 @@ class Boilerplate(QtWidgets.QMainWindow):
         
     def about_ac(self):
         QtGui.QMessageBox.about(self, "About CRBTool", VER_NOTE)
+# ----------------------------------------------------------------------
+# Cache helper functions
+# ----------------------------------------------------------------------
+
+def purge_bytecode_cache():
+    """Remove all locally cached bytecode, return the number of files"""
+    CODE_CACHE.clear()
+    return BYTECODE_CACHE.purge()
+
+
+def host_version():
+    """Return the version of the host application, or None standalone"""
+    if MAYA:
+        return cmds.about(version=True)
+    if NUKE:
+        return nuke.NUKE_VERSION_STRING
+    return None
+
+
+def set_palette(window):
+    """Theme the application, or only window, with the Maya palette"""
+    palette_file = PALETTE_FILEPATH or mayapalette.pick_theme(UI_PATH, host_version())
+    mayapalette.set_maya_palette_with_tweaks(
+        palette_file, widget=window if PALETTE_WINDOW_ONLY else None,
+        cache_dir=os.path.join(CACHE_PATH, 'palette'))
+
+
 # ----------------------------------------------------------------------
 # DCC application helper functions
 # ----------------------------------------------------------------------
@@ -578,27 +1102,24 @@ def _maya_delete_ui():
 
 def _nuke_delete_ui():
     """Delete existing UI in Nuke"""
-    for obj in QtWidgets.QApplication.allWidgets():
-        if obj.objectName() == WINDOW_OBJECT:
-            obj.deleteLater()
+    for obj in hostwindows.registered(WINDOW_OBJECT):
+        obj.deleteLater()
+
+
+def _existing_window():
+    """Return the live window of an earlier launch, or None"""
+    windows = hostwindows.registered(WINDOW_OBJECT)
+    return windows[-1] if windows else None
 
 
 def _maya_main_window():
     """Return Maya's main window"""
-    for obj in QtWidgets.qApp.topLevelWidgets():
-        if obj.objectName() == 'MayaWindow':
-            return obj
-    raise RuntimeError('Could not find MayaWindow instance')
+    return hostwindows.maya_main_window()
 
 
 def _nuke_main_window():
     """Returns Nuke's main window"""
-    for obj in QtWidgets.qApp.topLevelWidgets():
-        if (obj.inherits('QMainWindow') and
-                obj.metaObject().className() == 'Foundry::UI::DockMainWindow'):
-            return obj
-    else:
-        raise RuntimeError('Could not find DockMainWindow instance')
+    return hostwindows.nuke_main_window()
 
 
 def _nuke_set_zero_margins(widget_object):
@@ -607,34 +1128,30 @@ def _nuke_set_zero_margins(widget_object):
     .. _More info:
         https://gist.github.com/maty974/4739917
     """
-    parentApp = QtWidgets.QApplication.allWidgets()
-    parentWidgetList = []
-    for parent in parentApp:
-        for child in parent.children():
-            if widget_object.__class__.__name__ == child.__class__.__name__:
-                parentWidgetList.append(
-                    parent.parentWidget())
-                parentWidgetList.append(
-                    parent.parentWidget().parentWidget())
-                parentWidgetList.append(
-                    parent.parentWidget().parentWidget().parentWidget())
-
-                for sub in parentWidgetList:
-                    for tinychild in sub.children():
-                        try:
-                            tinychild.setContentsMargins(0, 0, 0, 0)
-                        except:
-                            pass
+    hostwindows.set_zero_margins(widget_object)
 
 
 # ----------------------------------------------------------------------
 # Run functions
 # ----------------------------------------------------------------------
 
-def run_maya():
-    """Run in Maya"""
-    _maya_delete_ui()  # Delete any existing existing UI
+@phasetimer.timed('run_maya')
+def run_maya(rebuild=REBUILD_WINDOW):
+    """Run in Maya, showing the window of an earlier launch unless rebuild"""
+    crb = None if rebuild else _existing_window()
+    if crb is not None:
+        with phasetimer.phase('reuse'):
+            crb.reuse()
+            if cmds.dockControl(WINDOW_TITLE, q=True, ex=True):
+                cmds.dockControl(WINDOW_TITLE, e=True, visible=True, r=True)
+        return
+
+    with phasetimer.phase('delete_ui'):
+        _maya_delete_ui()  # Delete any existing existing UI
     crb = Boilerplate(parent=_maya_main_window())
+    if PALETTE_WINDOW_ONLY:
+        with phasetimer.phase('palette'):
+            set_palette(crb)
 
     # Makes Maya perform magic which makes the window stay
     # on top in OS X and Linux. As an added bonus, it'll
@@ -649,7 +1166,8 @@ def run_maya():
                          content=WINDOW_OBJECT, allowedArea=allowed_areas)
 
 
-def run_nuke():
+@phasetimer.timed('run_nuke')
+def run_nuke(rebuild=REBUILD_WINDOW):
     """Run in Nuke
 
     Note:
@@ -660,8 +1178,18 @@ def run_nuke():
 
         If you want the UI to be modal:
         `boil.ui.setWindowModality(QtCore.Qt.WindowModal)`
+
+        A floating window of an earlier launch is shown again unless
+        rebuild is True; a docked panel is always built anew.
     """
-    _nuke_delete_ui()  # Delete any alrady existing UI
+    boil = None if rebuild or DOCK_WITH_NUKE_UI else _existing_window()
+    if boil is not None:
+        with phasetimer.phase('reuse'):
+            boil.reuse()
+        return
+
+    with phasetimer.phase('delete_ui'):
+        _nuke_delete_ui()  # Delete any alrady existing UI
     if not DOCK_WITH_NUKE_UI:
         boil = Boilerplate(parent=_nuke_main_window())
         boil.setWindowFlags(QtCore.Qt.Tool)
@@ -681,6 +1209,9 @@ def run_nuke():
         panel.addToPane(pane)
         boil = panel.customKnob.getObject().widget
         _nuke_set_zero_margins(boil)
+    if PALETTE_WINDOW_ONLY:
+        with phasetimer.phase('palette'):
+            set_palette(boil)
 
 
 def run_standalone():
@@ -694,12 +1225,14 @@ def run_standalone():
     .. _Issue #9:
        https://github.com/fredrikaverpil/pyvfx-boilerplate/issues/9
     """
-    app = QtWidgets.QApplication(sys.argv)
-    boil = Boilerplate()
-    if not (platform.system() == 'Darwin' and
-            (QtCompat.__binding__ == 'PySide' or QtCompat.__binding__ == 'PyQt4')):
-        mayapalette.set_maya_palette_with_tweaks(PALETTE_FILEPATH)
-    boil.show()  # Show the UI
+    with phasetimer.phase('run_standalone'):
+        app = QtWidgets.QApplication(sys.argv)
+        boil = Boilerplate()
+        if not (platform.system() == 'Darwin' and
+                (QtCompat.__binding__ == 'PySide' or QtCompat.__binding__ == 'PyQt4')):
+            with phasetimer.phase('palette'):
+                set_palette(boil)
+        boil.show()  # Show the UI
     sys.exit(app.exec_())
 
 
@@ -0,0 +1,49 @@
+"""Set and get QPalette data from Maya (any binding, through Qt.py)
+
+Shares its code with boilerlib.mayapalette; run with the CRBTool folder
+on sys.path, as it is once the tool has been opened.
+
+# Example: fetch palette data from Maya
+data = getPaletteInfo()
+print(data)
+write_json(data)
+
+# Example: read palette JSON file and set palette
+data = read_json()
+print(data)
+setPaletteFromDict(data)
+setStylePlastique()
+setMayaTweaks()
+"""
+
+import os
+from boilerlib import mayapalette
+from boilerlib.mayapalette import GROUPS, ROLES  # noqa: F401
+
+
+STYLE = 'plastique'
+JSON_PATH = os.path.join(os.path.expanduser('~'), 'Desktop', 'qpalette.json')
+
+
+def getPaletteInfo():
+    return mayapalette.palette_to_dict()
+
+
+def setPaletteFromDict(dct):
+    mayapalette.set_palette_from_dict(dct)
+
+
+def setStylePlastique():
+    mayapalette.set_style(preferred=STYLE)
+
+
+def setMayaTweaks():
+    mayapalette.set_maya_tweaks()
+
+
+def write_json(data, filepath=JSON_PATH):
+    mayapalette.write_json(data, filepath)
+
+
+def read_json(filepath=JSON_PATH):
+    return mayapalette.read_json(filepath)
@@ -19,6 +19,10 @@ DIR_PATH = 'C:/CRBTool'
 FILE_PATH = os.path.join(DIR_PATH, 'save.json')
 CUS_FILE_PATH = os.path.join(DIR_PATH, 'cus_save.json')
 
+# Per-user local cache (compiled scripts), kept off the network shares
+CACHE_PATH = os.path.join(
+    os.environ.get('LOCALAPPDATA', os.path.expanduser('~')), 'CRBTool', 'cache')
+
 VER_NOTE = '<b>CRBTool</b><br>Mini Tool for Render<br>version 0.9 Beta'
 
 
@@ -26,13 +30,27 @@ VER_NOTE = '<b>CRBTool</b><br>Mini Tool for Render<br>version 0.9 Beta'
 # ----------------------------------------------------------------------
 # Main script
 # ----------------------------------------------------------------------
-def main():
+def main(rebuild=False):
+    """Show CRBTool, reusing the open window
+
+    With rebuild the tool is reloaded and its window built anew, to
+    pick up changes to the code.
+    """
     if PATH not in sys.path:
         sys.path.append(PATH)
-    
-    import CRBTool.crbTool as crb
-    reload(crb)
-    crb.run_maya()
+    # crbTool imports boilerlib from here, share its phase timer
+    repo_path = os.path.join(PATH, 'CRBTool')
+    if repo_path not in sys.path:
+        sys.path.append(repo_path)
+    from boilerlib import phasetimer
+
+    with phasetimer.phase('main'):
+        with phasetimer.phase('import'):
+            import CRBTool.crbTool as crb
+        if rebuild:
+            with phasetimer.phase('reload'):
+                reload(crb)
+        crb.run_maya(rebuild=rebuild or crb.REBUILD_WINDOW)
 
 
 if __name__=='__main__':